@@ -1,9 +1,42 @@
+from .blocking import ResourceFilter
+from .breaker import CircuitBreaker, ModeRouter, get_mode_router
 from .cookies_impl import Cookies
-from .core import get_flights_from_filter, get_flights
+from .core import (
+    get_flights_from_filter,
+    get_flights_from_filter_async,
+    get_flights_from_filter_batch,
+    get_flights_from_filter_batch_async,
+    get_flights_from_filter_iter,
+    get_flights_from_filter_iter_async,
+    get_flights,
+    get_flights_async,
+    get_flights_iter,
+    get_flights_iter_async,
+    iter_flights,
+)
+from .deadline import Deadline, DeadlineExceeded
 from .filter import create_filter
+from .hedge import Hedger, LatencyTracker, get_hedger, get_latency_tracker
 from .flights_impl import Airport, FlightData, Passengers, TFSData
-from .schema import Flight, Result
+from .retry import RetryPolicy, StatusError, classify
+from .schema import Flight, Result, Segment
+from .metrics import ParseMetrics, ParseReport, get_parse_metrics, set_parse_metrics
+from .parsecache import ParseCache, configure_parse_cache, get_parse_cache
+from .parsepool import ParsePool, configure_parse_pool, get_parse_pool
+from .pool import ClientPool, configure_client_pool, get_client_pool
+from .ratelimit import RateLimiter, TokenBucket, get_rate_limiter
 from .search import search_airport
+from .singleflight import SingleFlight, get_single_flight
+from .streaming import stream_stats
+from .trim import trim_stats
+from .transport import (
+    CassetteStore,
+    HttpTransport,
+    RecordingTransport,
+    ReplayTransport,
+    get_transport,
+    set_transport,
+)
 
 __all__ = [
     "Airport",
@@ -14,7 +47,56 @@ __all__ = [
     "get_flights_from_filter",
     "Result",
     "Flight",
+    "Segment",
     "search_airport",
     "Cookies",
     "get_flights",
+    "get_flights_async",
+    "get_flights_from_filter_async",
+    "get_flights_from_filter_batch",
+    "get_flights_from_filter_batch_async",
+    "get_flights_iter",
+    "get_flights_iter_async",
+    "get_flights_from_filter_iter",
+    "get_flights_from_filter_iter_async",
+    "iter_flights",
+    "ClientPool",
+    "get_client_pool",
+    "configure_client_pool",
+    "RateLimiter",
+    "TokenBucket",
+    "get_rate_limiter",
+    "RetryPolicy",
+    "StatusError",
+    "classify",
+    "CircuitBreaker",
+    "ModeRouter",
+    "get_mode_router",
+    "SingleFlight",
+    "get_single_flight",
+    "ResourceFilter",
+    "Hedger",
+    "LatencyTracker",
+    "get_hedger",
+    "get_latency_tracker",
+    "Deadline",
+    "DeadlineExceeded",
+    "stream_stats",
+    "CassetteStore",
+    "HttpTransport",
+    "RecordingTransport",
+    "ReplayTransport",
+    "get_transport",
+    "set_transport",
+    "trim_stats",
+    "ParseCache",
+    "get_parse_cache",
+    "configure_parse_cache",
+    "ParsePool",
+    "get_parse_pool",
+    "configure_parse_pool",
+    "ParseMetrics",
+    "ParseReport",
+    "get_parse_metrics",
+    "set_parse_metrics",
 ]
@@ -0,0 +1,323 @@
+"""Parser micro-benchmark over recorded or synthesized result pages.
+
+::
+
+    python -m fast_flights.benchmark --cassettes cassettes/ --repeat 20
+    python -m fast_flights.benchmark --retained 500
+    python -m fast_flights.benchmark --workers 0,1,2,4
+    python -m fast_flights.benchmark --playwright 10
+
+Pages come from a cassette directory (see :mod:`fast_flights.transport`) or,
+without one, from the stand-in server's page generator. ``--playwright``
+instead loads live result pages in Chromium, with and without request
+filtering (see :mod:`fast_flights.blocking`), and needs Playwright and
+network access.
+"""
+
+import argparse
+import asyncio
+import datetime
+import functools
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from .core import parse_response
+from .blocking import ResourceFilter
+from .flights_impl import FlightData, Passengers, TFSData
+from .parsepool import ParsePool
+from .standin import render_page
+from .transport import _cassette_response
+
+
+def load_cassette_pages(directory: str) -> List[Any]:
+    """Responses for every successful cassette in ``directory``."""
+    pages = []
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            cassette = json.load(f)
+        if cassette["status_code"] == 200:
+            pages.append(_cassette_response(200, cassette["text"]))
+    return pages
+
+
+def synthetic_pages(count: int = 50) -> List[Any]:
+    """Stand-in result pages for ``count`` different one-way queries."""
+    pages = []
+    for day in range(count):
+        info = TFSData.from_interface(
+            flight_data=[
+                FlightData(
+                    date=f"2025-{day // 28 % 12 + 1:02d}-{day % 28 + 1:02d}",
+                    from_airport="ICN",
+                    to_airport="NRT",
+                )
+            ],
+            trip="one-way",
+            passengers=Passengers(adults=1),
+            seat="economy",
+        ).pb()
+        pages.append(_cassette_response(200, render_page(info)))
+    return pages
+
+
+def range_search_pages(pairs: int = 500) -> List[Any]:
+    """Stand-in round-trip pages for ``pairs`` date pairs, as a range search sees."""
+    pages = []
+    start = datetime.date(2025, 3, 1)
+    for i in range(pairs):
+        depart = start + datetime.timedelta(days=i // 10)
+        back = depart + datetime.timedelta(days=3 + i % 10)
+        info = TFSData.from_interface(
+            flight_data=[
+                FlightData(date=depart.isoformat(), from_airport="ICN", to_airport="NRT"),
+                FlightData(date=back.isoformat(), from_airport="NRT", to_airport="ICN"),
+            ],
+            trip="round-trip",
+            passengers=Passengers(adults=1),
+            seat="economy",
+        ).pb()
+        pages.append(_cassette_response(200, render_page(info, padding=0)))
+    return pages
+
+
+def bench_retained(
+    pages: List[Any], parse: Callable[[Any], Any] = parse_response
+) -> dict:
+    """Memory held by the parsed results of every page, all kept alive."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    results = [parse(page) for page in pages]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    flights = sum(len(result.flights) for result in results)
+    return {
+        "pages": len(pages),
+        "flights": flights,
+        "retained_kib": retained / 1024,
+        "bytes_per_flight": retained / flights if flights else 0.0,
+    }
+
+
+def bench_parse(
+    pages: List[Any],
+    parse: Callable[[Any], Any] = parse_response,
+    *,
+    repeat: int = 10,
+) -> dict:
+    """Time ``parse`` over ``pages`` and measure its peak Python memory.
+
+    Args:
+        pages (list): Response-like objects with ``text``.
+        parse (Callable): The parser under test.
+        repeat (int): Timed passes over all pages.
+    """
+    timings = []
+    for _ in range(repeat):
+        for page in pages:
+            started_at = time.perf_counter()
+            parse(page)
+            timings.append(time.perf_counter() - started_at)
+
+    # Memory is measured in a separate pass; tracing skews timings
+    tracemalloc.start()
+    peaks = []
+    for page in pages:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        parse(page)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "pages": len(pages),
+        "mean_ms": statistics.mean(timings) * 1e3,
+        "p50_ms": timings[len(timings) // 2] * 1e3,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1e3,
+        "peak_kib_per_page": statistics.mean(peaks) / 1024,
+    }
+
+
+def bench_workers(pages: List[Any], workers: int, *, parser: str = "dom") -> dict:
+    """Throughput of parsing every page with ``workers`` processes.
+
+    All pages are submitted at once, as a concurrent range search would;
+    ``workers=0`` parses them one by one in this process.
+    """
+    if not workers:
+        started_at = time.perf_counter()
+        for page in pages:
+            parse_response(page, parser=parser)  # type: ignore
+        elapsed = time.perf_counter() - started_at
+        return {"workers": 0, "pages": len(pages), "pages_per_second": len(pages) / elapsed}
+
+    async def parse_all(pool: ParsePool, pages: List[Any]) -> None:
+        await asyncio.gather(*(pool.parse_async(page.text, parser=parser) for page in pages))
+
+    pool = ParsePool(workers=workers)
+    try:
+        # Start and warm every worker before timing
+        asyncio.run(parse_all(pool, pages[:workers]))
+        started_at = time.perf_counter()
+        asyncio.run(parse_all(pool, pages))
+        elapsed = time.perf_counter() - started_at
+    finally:
+        pool.shutdown()
+    return {
+        "workers": workers,
+        "pages": len(pages),
+        "pages_per_second": len(pages) / elapsed,
+    }
+
+
+class _AllowAll(ResourceFilter):
+    # Routes every request like ResourceFilter does, but blocks nothing
+    def allows(self, url: str, resource_type: str) -> bool:
+        return True
+
+
+def playwright_urls(count: int) -> List[str]:
+    """Results page URLs for ``count`` one-way queries starting next month."""
+    from .core import _build_params
+    from .local_playwright import _flights_url
+
+    start = datetime.date.today() + datetime.timedelta(days=30)
+    urls = []
+    for day in range(count):
+        filter = TFSData.from_interface(
+            flight_data=[
+                FlightData(
+                    date=(start + datetime.timedelta(days=day)).isoformat(),
+                    from_airport="ICN",
+                    to_airport="NRT",
+                )
+            ],
+            trip="one-way",
+            passengers=Passengers(adults=1),
+            seat="economy",
+        )
+        urls.append(_flights_url(_build_params(filter, "")))
+    return urls
+
+
+async def _load_page(browser: Any, url: str, resource_filter: ResourceFilter) -> tuple:
+    # A fresh context per page so no run profits from another's cache
+    context = await browser.new_context()
+    await context.route("**/*", resource_filter.handle)
+    page = await context.new_page()
+    sizes = []
+    page.on("requestfinished", lambda request: sizes.append(request.sizes()))
+    try:
+        started_at = time.perf_counter()
+        await page.goto(url)
+        if page.url.startswith("https://consent.google.com"):
+            await page.click('text="Accept all"')
+        await page.locator(".eQ35Ce").wait_for()
+        elapsed = time.perf_counter() - started_at
+        received = sum(
+            size["responseBodySize"] + size["responseHeadersSize"]
+            for size in await asyncio.gather(*sizes)
+        )
+    finally:
+        await context.close()
+    return elapsed, received
+
+
+async def _bench_playwright(urls: List[str]) -> List[dict]:
+    from playwright.async_api import async_playwright
+
+    filters = {"filtered": ResourceFilter(), "unfiltered": _AllowAll()}
+    samples: dict = {name: ([], []) for name in filters}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            for url in urls:
+                # Alternate so both settings see the same network conditions
+                for name, resource_filter in filters.items():
+                    elapsed, received = await _load_page(browser, url, resource_filter)
+                    samples[name][0].append(elapsed)
+                    samples[name][1].append(received)
+        finally:
+            await browser.close()
+
+    return [
+        {
+            "filter": name,
+            "pages": len(urls),
+            "mean_seconds_to_results": statistics.mean(timings),
+            "p50_seconds_to_results": statistics.median(timings),
+            "mean_kib_per_page": statistics.mean(received) / 1024,
+            "requests": filters[name].stats(),
+        }
+        for name, (timings, received) in samples.items()
+    ]
+
+
+def bench_playwright(urls: List[str]) -> List[dict]:
+    """Bytes received and time until ``.eQ35Ce`` appears, per page, with the
+    default ``ResourceFilter`` and with a filter that blocks nothing."""
+    return asyncio.run(_bench_playwright(urls))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cassettes", help="Directory of recorded pages")
+    parser.add_argument("--pages", type=int, default=50, help="Synthetic pages to use")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--retained",
+        type=int,
+        metavar="PAIRS",
+        help="Instead, measure memory held by the results of a range search",
+    )
+    parser.add_argument(
+        "--workers",
+        metavar="COUNTS",
+        help="Instead, measure parse throughput for comma-separated worker counts",
+    )
+    parser.add_argument(
+        "--playwright",
+        type=int,
+        metavar="QUERIES",
+        help="Instead, load live pages in Chromium with and without request filtering",
+    )
+    parser.add_argument("--parser", choices=("dom", "embedded"), default="dom")
+    parser.add_argument(
+        "--no-trim", action="store_true", help="Parse whole pages (see fast_flights.trim)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.playwright:
+        print(json.dumps(bench_playwright(playwright_urls(args.playwright)), indent=2))
+        return
+
+    if args.retained:
+        parse = functools.partial(parse_response, parser=args.parser)
+        print(json.dumps(bench_retained(range_search_pages(args.retained), parse), indent=2))
+        return
+
+    pages = load_cassette_pages(args.cassettes) if args.cassettes else synthetic_pages(args.pages)
+    if not pages:
+        parser.error("No recorded pages with status 200 found")
+
+    if args.workers:
+        counts = [int(count) for count in args.workers.split(",")]
+        results = [bench_workers(pages, count, parser=args.parser) for count in counts]
+        print(json.dumps(results, indent=2))
+        return
+
+    result = bench_parse(
+        pages,
+        functools.partial(parse_response, parser=args.parser, trim=not args.no_trim),
+        repeat=args.repeat,
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
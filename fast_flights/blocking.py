@@ -0,0 +1,67 @@
+"""Request filtering for the Playwright fetch paths."""
+
+import threading
+from typing import Any, Iterable, Optional
+from urllib.parse import urlsplit
+
+# Only ``[role="main"]`` is read from the page, so nothing visual is needed
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Hosts (and their subdomains) the results page needs to render
+ALLOWED_HOSTS = ("google.com", "gstatic.com", "googleapis.com")
+
+
+def host_allowed(host: str, allowed_hosts: Iterable[str]) -> bool:
+    return any(host == h or host.endswith("." + h) for h in allowed_hosts)
+
+
+class ResourceFilter:
+    """Aborts non-essential requests made while loading a results page.
+
+    Pass ``handle`` to ``context.route("**/*", ...)``.
+
+    Args:
+        blocked_types (Iterable[str], optional): Playwright resource types to
+            abort. Defaults to ``BLOCKED_RESOURCE_TYPES``.
+        allowed_hosts (Iterable[str], optional): Hosts allowed to load; every
+            other host is aborted. Defaults to ``ALLOWED_HOSTS``.
+    """
+
+    def __init__(
+        self,
+        *,
+        blocked_types: Optional[Iterable[str]] = None,
+        allowed_hosts: Optional[Iterable[str]] = None,
+    ):
+        self.blocked_types = frozenset(
+            BLOCKED_RESOURCE_TYPES if blocked_types is None else blocked_types
+        )
+        self.allowed_hosts = tuple(
+            ALLOWED_HOSTS if allowed_hosts is None else allowed_hosts
+        )
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._blocked = 0
+
+    def allows(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.blocked_types:
+            return False
+        return host_allowed(urlsplit(url).hostname or "", self.allowed_hosts)
+
+    async def handle(self, route: Any) -> None:
+        request = route.request
+        allowed = self.allows(request.url, request.resource_type)
+        with self._lock:
+            if allowed:
+                self._allowed += 1
+            else:
+                self._blocked += 1
+
+        if allowed:
+            await route.continue_()
+        else:
+            await route.abort()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"allowed": self._allowed, "blocked": self._blocked}
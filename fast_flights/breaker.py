@@ -0,0 +1,177 @@
+"""Per-mode health tracking and circuit breaking for fetch modes."""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class CircuitBreaker:
+    """Tracks recent outcomes of one fetch mode.
+
+    The breaker opens when the failure rate over the last ``window`` outcomes
+    reaches ``failure_threshold``, or when ``slow_threshold`` is set and the
+    moving average of successful attempts' latency exceeds it. After
+    ``cooldown`` seconds it lets a single probe through (half-open); a
+    successful probe that is not itself too slow closes it again.
+
+    Args:
+        window (int): Number of recent outcomes considered.
+        min_samples (int): Outcomes required before the breaker may open.
+        failure_threshold (float): Failure rate (0-1) that opens the breaker.
+        cooldown (float): Seconds to stay open before probing.
+        slow_threshold (float, optional): Latency EWMA, in seconds, above
+            which the mode counts as unhealthy.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int = 20,
+        min_samples: int = 5,
+        failure_threshold: float = 0.5,
+        cooldown: float = 60.0,
+        slow_threshold: Optional[float] = None,
+    ):
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.slow_threshold = slow_threshold
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._latency: Optional[float] = None
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a query may use this mode right now."""
+        with self._lock:
+            if self._state == "closed":
+                return True
+
+            if self._state == "open":
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self._state = "half-open"
+
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._outcomes.append(True)
+            self._probing = False
+            slow = self.slow_threshold
+
+            if self._state == "half-open":
+                if slow is not None and latency > slow:
+                    self._open()
+                    return
+                self._state = "closed"
+                self._outcomes.clear()
+                # Start afresh so the slow history does not reopen it at once
+                self._latency = latency
+                return
+
+            self._latency = (
+                latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            )
+            if (
+                slow is not None
+                and self._state == "closed"
+                and len(self._outcomes) >= self.min_samples
+                and self._latency > slow
+            ):
+                self._open()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            self._probing = False
+
+            if self._state == "half-open":
+                self._open()
+                return
+
+            failures = self._outcomes.count(False)
+            if (
+                len(self._outcomes) >= self.min_samples
+                and failures / len(self._outcomes) >= self.failure_threshold
+            ):
+                self._open()
+
+    def release(self) -> None:
+        """Give up a probe slot without recording an outcome (e.g. cancellation)."""
+        with self._lock:
+            self._probing = False
+
+    def _open(self) -> None:
+        self._state = "open"
+        self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = len(self._outcomes)
+            return {
+                "state": self._state,
+                "samples": total,
+                "success_rate": (
+                    self._outcomes.count(True) / total if total else None
+                ),
+                "latency_ewma": self._latency,
+            }
+
+
+class ModeRouter:
+    """Circuit breakers for each fetch mode.
+
+    ``mode="fallback"`` queries ask the router whether the cheap ``common``
+    path is healthy (failing rarely and answering quickly enough); while its
+    breaker is open they go straight to ``force-fallback`` instead of paying a
+    failed or slow request first.
+    """
+
+    def __init__(self, **breaker_options):
+        self._options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, mode: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(mode)
+            if breaker is None:
+                breaker = self._breakers[mode] = CircuitBreaker(**self._options)
+            return breaker
+
+    def configure(self, mode: str, **breaker_options) -> CircuitBreaker:
+        """Replace one mode's breaker with one built from these options."""
+        breaker = CircuitBreaker(**{**self._options, **breaker_options})
+        with self._lock:
+            self._breakers[mode] = breaker
+        return breaker
+
+    def allow(self, mode: str) -> bool:
+        return self.breaker(mode).allow()
+
+    def stats(self) -> dict:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {mode: b.stats() for mode, b in breakers.items()}
+
+
+_router = ModeRouter()
+# A healthy common fetch takes a second or two; hedging covers single stragglers
+_router.configure("common", slow_threshold=8.0)
+
+
+def get_mode_router() -> ModeRouter:
+    """Get the process-wide fetch mode router."""
+    return _router
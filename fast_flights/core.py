@@ -1,19 +1,364 @@
-from typing import List, Literal, Optional
+import asyncio
+import datetime
+import itertools
+import sys
+import time
+from typing import Dict, Iterator, List, Literal, NamedTuple, Optional, Tuple, Union
 
 from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 from .schema import Flight, Result
 from .flights_impl import FlightData, Passengers
 from .filter import TFSData
-from .fallback_playwright import fallback_playwright_fetch
-from .primp import Client, Response
+from .breaker import get_mode_router
+from .deadline import Deadline, DeadlineExceeded, remaining
+from .embedded import extract_payload, iter_embedded_flights, page_currency, parse_embedded
+from .normalize import parse_clock, parse_duration, parse_price
+from .hedge import get_hedger, get_latency_tracker
+from .metrics import OUTCOMES, ParseReport, get_parse_metrics
+from .fallback_playwright import (
+    fallback_playwright_fetch,
+    fallback_playwright_fetch_async,
+    fallback_playwright_fetch_batch,
+    fallback_playwright_fetch_batch_async,
+)
+from .parsecache import get_parse_cache, page_key
+from .parsepool import get_parse_pool
+from .primp import Response
+from .ratelimit import get_rate_limiter
+from .retry import DEFAULT_RETRY_POLICY, RetryPolicy, StatusError
+from .singleflight import get_single_flight
+from .transport import get_transport
+from .trim import trim_to_results
+
+
+class _QueryOptions(NamedTuple):
+    hedge: bool = False
+    deadline: Optional[Deadline] = None
+    stream: bool = False
+    parser: str = "dom"
+    query_date: Optional[datetime.date] = None
+    lazy: bool = False
+
+
+def _get(
+    params: dict,
+    impersonate: str = "chrome_126",
+    timeout: Optional[float] = None,
+    stream: bool = False,
+) -> Response:
+    started_at = time.monotonic()
+    res = get_transport().get(
+        params, impersonate=impersonate, timeout=timeout, stream=stream
+    )
+    if res.status_code != 200:
+        raise StatusError(res.status_code, res.text_markdown)
+    get_latency_tracker().record(time.monotonic() - started_at)
+    return res
 
 
-def fetch(params: dict) -> Response:
-    client = Client(impersonate="chrome_126", verify=False)
-    res = client.get("https://www.google.com/travel/flights", params=params)
-    assert res.status_code == 200, f"{res.status_code} Result: {res.text_markdown}"
-    return res
+def _hedge_get(
+    params: dict, deadline: Optional[Deadline], stream: bool = False
+) -> Response:
+    # The hedge uses a different profile so it cannot queue behind the
+    # primary's connection
+    get_rate_limiter().acquire(get_transport().host, "common", remaining(deadline))
+    return _get(params, "chrome_127", remaining(deadline), stream)
+
+
+def fetch(
+    params: dict,
+    *,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+) -> Response:
+    """Fetch a Google Flights results page.
+
+    With ``hedge=True``, a second identical request is issued if the first one
+    is still pending after the p95 latency, and the first response wins.
+    ``timeout`` bounds the whole call, including rate-limit waits.
+    ``stream=True`` reads the body incrementally and stops as soon as the
+    result lists are complete (see :mod:`fast_flights.streaming`).
+
+    Requests go through the transport set with
+    :func:`~fast_flights.transport.set_transport`, which can record responses
+    to disk or replay them offline.
+    """
+    deadline = Deadline.after(timeout)
+    get_rate_limiter().acquire(get_transport().host, "common", remaining(deadline))
+    if hedge:
+        return get_hedger().run(
+            lambda: _get(params, timeout=remaining(deadline), stream=stream),
+            lambda: _hedge_get(params, deadline, stream),
+        )
+    return _get(params, timeout=remaining(deadline), stream=stream)
+
+
+async def fetch_async(
+    params: dict,
+    *,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+) -> Response:
+    """Async variant of :func:`fetch`.
+
+    The blocking request runs on the default executor, so the event loop stays
+    free while waiting for Google.
+    """
+    deadline = Deadline.after(timeout)
+    await get_rate_limiter().acquire_async(
+        get_transport().host, "common", remaining(deadline)
+    )
+    loop = asyncio.get_running_loop()
+    if not hedge:
+        return await loop.run_in_executor(
+            None, _get, params, "chrome_126", remaining(deadline), stream
+        )
+
+    async def hedge_get() -> Response:
+        await get_rate_limiter().acquire_async(
+            get_transport().host, "common", remaining(deadline)
+        )
+        return await loop.run_in_executor(
+            None, _get, params, "chrome_127", remaining(deadline), stream
+        )
+
+    return await get_hedger().run_async(
+        lambda: loop.run_in_executor(
+            None, _get, params, "chrome_126", remaining(deadline), stream
+        ),
+        hedge_get,
+    )
+
+
+def _query_date(filter: TFSData) -> Optional[datetime.date]:
+    try:
+        return datetime.date.fromisoformat(filter.flight_data[0].date)
+    except (IndexError, ValueError):
+        return None
+
+
+def _build_params(filter: TFSData, currency: str) -> dict:
+    return {
+        "tfs": filter.as_b64().decode("utf-8"),
+        "hl": "en",
+        "tfu": "EgQIABABIgA",
+        "curr": currency,
+    }
+
+
+def _run_parser(
+    res: Response,
+    *,
+    parser: str,
+    currency: str,
+    query_date: Optional[datetime.date],
+) -> Result:
+    pool = get_parse_pool()
+    if pool is not None:
+        return pool.parse(
+            res.text, parser=parser, currency=currency, query_date=query_date
+        )
+    return parse_response(
+        res, parser=parser, currency=currency, query_date=query_date  # type: ignore
+    )
+
+
+def _parse_cached(
+    res: Response,
+    *,
+    parser: str,
+    currency: str,
+    query_date: Optional[datetime.date],
+) -> Result:
+    """``parse_response`` behind the process-wide parse cache and, when one is
+    configured, in the parse pool."""
+    cache = get_parse_cache()
+    if cache.max_size <= 0:
+        return _run_parser(res, parser=parser, currency=currency, query_date=query_date)
+
+    key = page_key(res.text, parser, currency, query_date)
+    result = cache.get(key)
+    if result is None:
+        result = _run_parser(
+            res, parser=parser, currency=currency, query_date=query_date
+        )
+        cache.put(key, result)
+    return result
+
+
+def _parse(
+    res: Response, params: dict, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    if not opts.lazy:
+        return _parse_cached(
+            res,
+            parser=opts.parser,
+            currency=params["curr"],
+            query_date=opts.query_date,
+        )
+
+    flights = iter_flights(
+        res,
+        parser=opts.parser,
+        currency=params["curr"],
+        query_date=opts.query_date,
+    )
+    # Parse the first flight now so an empty page fails (and is retried)
+    # like it does with parse_response
+    first = next(flights, None)
+    if first is None:
+        raise RuntimeError("No flights found:\n{}".format(res.text_markdown))
+    return itertools.chain((first,), flights)
+
+
+async def _parse_async(
+    res: Response, params: dict, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    """:func:`_parse` without blocking the event loop.
+
+    With a parse pool the worker's result is awaited directly, so no thread
+    is tied up per page; otherwise the page is parsed in the default executor.
+    """
+    pool = get_parse_pool()
+    if pool is None or opts.lazy:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _parse, res, params, opts)
+
+    cache = get_parse_cache()
+    key = None
+    if cache.max_size > 0:
+        key = page_key(res.text, opts.parser, params["curr"], opts.query_date)
+        result = cache.get(key)
+        if result is not None:
+            return result
+    result = await pool.parse_async(
+        res.text,
+        parser=opts.parser,
+        currency=params["curr"],
+        query_date=opts.query_date,
+    )
+    if key is not None:
+        cache.put(key, result)
+    return result
+
+
+def _attempt(
+    params: dict, mode: str, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    """Fetch and parse once with a single mode, recording its health."""
+    breaker = get_mode_router().breaker(mode)
+    deadline = opts.deadline
+    started_at = time.monotonic()
+    try:
+        if mode == "common":
+            res = fetch(
+                params,
+                hedge=opts.hedge,
+                timeout=remaining(deadline),
+                stream=opts.stream,
+            )
+        elif mode == "local":
+            from .local_playwright import local_playwright_fetch
+
+            res = local_playwright_fetch(params, timeout=remaining(deadline))
+        else:
+            res = fallback_playwright_fetch(params, timeout=remaining(deadline))
+
+        remaining(deadline)
+        result = _parse(res, params, opts)
+    except DeadlineExceeded:
+        breaker.release()
+        raise
+    except Exception as e:
+        if deadline is not None and deadline.expired:
+            # A transport timeout caused by our own budget says nothing about
+            # the mode's health
+            breaker.release()
+            raise DeadlineExceeded("Deadline exceeded") from e
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+
+    breaker.record_success(time.monotonic() - started_at)
+    return result
+
+
+async def _attempt_async(
+    params: dict, mode: str, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    breaker = get_mode_router().breaker(mode)
+    deadline = opts.deadline
+    started_at = time.monotonic()
+    try:
+        if mode == "common":
+            res = await fetch_async(
+                params,
+                hedge=opts.hedge,
+                timeout=remaining(deadline),
+                stream=opts.stream,
+            )
+        elif mode == "local":
+            from .local_playwright import local_playwright_fetch_async
+
+            res = await local_playwright_fetch_async(
+                params, timeout=remaining(deadline)
+            )
+        else:
+            res = await fallback_playwright_fetch_async(
+                params, timeout=remaining(deadline)
+            )
+
+        remaining(deadline)
+        result = await _parse_async(res, params, opts)
+    except DeadlineExceeded:
+        breaker.release()
+        raise
+    except Exception as e:
+        if deadline is not None and deadline.expired:
+            breaker.release()
+            raise DeadlineExceeded("Deadline exceeded") from e
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+
+    breaker.record_success(time.monotonic() - started_at)
+    return result
+
+
+def _query(
+    params: dict, mode: str, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    if mode == "fallback":
+        # Skip the cheap path entirely while its breaker is open
+        if get_mode_router().allow("common"):
+            try:
+                return _attempt(params, "common", opts)
+            except (AssertionError, RuntimeError):
+                pass
+        return _attempt(params, "force-fallback", opts)
+
+    return _attempt(params, mode, opts)
+
+
+async def _query_async(
+    params: dict, mode: str, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    if mode == "fallback":
+        if get_mode_router().allow("common"):
+            try:
+                return await _attempt_async(params, "common", opts)
+            except (AssertionError, RuntimeError):
+                pass
+        return await _attempt_async(params, "force-fallback", opts)
+
+    return await _attempt_async(params, mode, opts)
 
 
 def get_flights_from_filter(
@@ -21,39 +366,246 @@ def get_flights_from_filter(
     currency: str = "",
     *,
     mode: Literal["common", "fallback", "force-fallback", "local"] = "common",
+    retry: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
 ) -> Result:
-    data = filter.as_b64()
+    """Get flights from a filter.
+
+    Transient failures are retried according to ``retry`` (defaults to
+    ``DEFAULT_RETRY_POLICY``); ``Result.attempts`` records how many attempts
+    the query took. Concurrent calls for the same ``tfs``, currency and mode
+    share a single fetch and receive the same ``Result``; if that fetch runs
+    out of its caller's ``timeout``, callers with time left fetch again
+    rather than sharing the ``DeadlineExceeded``. ``hedge=True``
+    enables hedged requests and ``stream=True`` early-terminating reads on the
+    ``common`` path (see :func:`fetch`). ``parser`` selects the page parser
+    (see :func:`parse_response`); streamed reads stop before the embedded
+    data, so ``stream=True`` with ``parser="embedded"`` parses the markup.
+    Pages identical to one parsed recently are served from the parse cache
+    (see :func:`fast_flights.parsecache.get_parse_cache`).
+
+    ``timeout`` is a total budget in seconds for fetching (including retries
+    and waits) and parsing; ``DeadlineExceeded`` is raised when it runs out.
+    """
+    policy = retry or DEFAULT_RETRY_POLICY
+    params = _build_params(filter, currency)
+    opts = _QueryOptions(
+        hedge=hedge,
+        deadline=Deadline.after(timeout),
+        stream=stream,
+        parser=parser,
+        query_date=_query_date(filter),
+    )
+    return get_single_flight().do(
+        (params["tfs"], currency, mode, parser),
+        lambda: _query_with_retry(params, mode, policy, opts),
+        timeout=timeout,
+    )
 
-    params = {
-        "tfs": data.decode("utf-8"),
-        "hl": "en",
-        "tfu": "EgQIABABIgA",
-        "curr": currency,
-    }
 
-    if mode in {"common", "fallback"}:
+async def get_flights_from_filter_async(
+    filter: TFSData,
+    currency: str = "",
+    *,
+    mode: Literal["common", "fallback", "force-fallback", "local"] = "common",
+    retry: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
+) -> Result:
+    """Async variant of :func:`get_flights_from_filter`.
+
+    Work still running when ``timeout`` expires is cancelled.
+    """
+    policy = retry or DEFAULT_RETRY_POLICY
+    params = _build_params(filter, currency)
+    opts = _QueryOptions(
+        hedge=hedge,
+        deadline=Deadline.after(timeout),
+        stream=stream,
+        parser=parser,
+        query_date=_query_date(filter),
+    )
+    return await get_single_flight().do_async(
+        (params["tfs"], currency, mode, parser),
+        lambda: _query_with_retry_async(params, mode, policy, opts),
+        timeout=timeout,
+    )
+
+
+def _query_with_retry(
+    params: dict, mode: str, policy: RetryPolicy, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    deadline = opts.deadline
+    started_at = time.monotonic()
+    attempt = 1
+
+    while True:
         try:
-            res = fetch(params)
-        except AssertionError as e:
-            if mode == "fallback":
-                res = fallback_playwright_fetch(params)
-            else:
+            result = _query(params, mode, opts)
+        except Exception as e:
+            delay = policy.next_delay(e, attempt, time.monotonic() - started_at)
+            if delay is None:
                 raise e
+            if deadline is not None and delay >= deadline.remaining():
+                raise DeadlineExceeded("Deadline exceeded") from e
+            time.sleep(delay)
+            attempt += 1
+            continue
 
-    elif mode == "local":
-        from .local_playwright import local_playwright_fetch
+        if isinstance(result, Result):
+            result.attempts = attempt
+        return result
 
-        res = local_playwright_fetch(params)
 
-    else:
-        res = fallback_playwright_fetch(params)
+async def _query_with_retry_async(
+    params: dict, mode: str, policy: RetryPolicy, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    deadline = opts.deadline
+    if deadline is None:
+        return await _retry_loop_async(params, mode, policy, opts)
 
     try:
-        return parse_response(res)
-    except RuntimeError as e:
-        if mode == "fallback":
-            return get_flights_from_filter(filter, mode="force-fallback")
-        raise e
+        return await asyncio.wait_for(
+            _retry_loop_async(params, mode, policy, opts),
+            deadline.remaining(),
+        )
+    except DeadlineExceeded:
+        raise
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceeded("Deadline exceeded") from e
+
+
+async def _retry_loop_async(
+    params: dict, mode: str, policy: RetryPolicy, opts: _QueryOptions
+) -> Union[Result, Iterator[Flight]]:
+    deadline = opts.deadline
+    started_at = time.monotonic()
+    attempt = 1
+
+    while True:
+        try:
+            result = await _query_async(params, mode, opts)
+        except Exception as e:
+            delay = policy.next_delay(e, attempt, time.monotonic() - started_at)
+            if delay is None:
+                raise e
+            if deadline is not None and delay >= deadline.remaining():
+                raise DeadlineExceeded("Deadline exceeded") from e
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        if isinstance(result, Result):
+            result.attempts = attempt
+        return result
+
+
+def get_flights_from_filter_iter(
+    filter: TFSData,
+    currency: str = "",
+    *,
+    mode: Literal["common", "fallback", "force-fallback", "local"] = "common",
+    retry: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
+) -> Iterator[Flight]:
+    """Like :func:`get_flights_from_filter`, but yield flights as they are parsed.
+
+    The page is fetched (and retried) up front; flights after the first are
+    only parsed as the iterator is consumed, so callers that stop early skip
+    the rest of the page. ``timeout`` covers fetching and the first flight.
+    Iterators cannot be shared, so concurrent calls are not deduplicated.
+    """
+    opts = _QueryOptions(
+        hedge=hedge,
+        deadline=Deadline.after(timeout),
+        stream=stream,
+        parser=parser,
+        query_date=_query_date(filter),
+        lazy=True,
+    )
+    return _query_with_retry(  # type: ignore
+        _build_params(filter, currency), mode, retry or DEFAULT_RETRY_POLICY, opts
+    )
+
+
+async def get_flights_from_filter_iter_async(
+    filter: TFSData,
+    currency: str = "",
+    *,
+    mode: Literal["common", "fallback", "force-fallback", "local"] = "common",
+    retry: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
+) -> Iterator[Flight]:
+    """Async variant of :func:`get_flights_from_filter_iter`.
+
+    Only the fetch is awaited; the returned iterator parses synchronously.
+    """
+    opts = _QueryOptions(
+        hedge=hedge,
+        deadline=Deadline.after(timeout),
+        stream=stream,
+        parser=parser,
+        query_date=_query_date(filter),
+        lazy=True,
+    )
+    return await _query_with_retry_async(  # type: ignore
+        _build_params(filter, currency), mode, retry or DEFAULT_RETRY_POLICY, opts
+    )
+
+
+def _parse_batch(
+    responses: list, filters: List[TFSData], currency: str
+) -> List[Union[Result, Exception]]:
+    results: List[Union[Result, Exception]] = []
+    for res, filter in zip(responses, filters):
+        if res is None:
+            results.append(RuntimeError("The page could not be loaded"))
+            continue
+        try:
+            results.append(
+                _parse_cached(
+                    res, parser="dom", currency=currency, query_date=_query_date(filter)
+                )
+            )
+        except RuntimeError as e:
+            results.append(e)
+    return results
+
+
+def get_flights_from_filter_batch(
+    filters: List[TFSData], currency: str = "", *, timeout: Optional[float] = None
+) -> List[Union[Result, Exception]]:
+    """Get flights for several filters with one remote Playwright run.
+
+    Returns one entry per filter, in order: a ``Result``, or the exception
+    explaining why that query failed. ``timeout`` bounds the remote run.
+    """
+    responses = fallback_playwright_fetch_batch(
+        [_build_params(filter, currency) for filter in filters], timeout
+    )
+    return _parse_batch(responses, filters, currency)
+
+
+async def get_flights_from_filter_batch_async(
+    filters: List[TFSData], currency: str = "", *, timeout: Optional[float] = None
+) -> List[Union[Result, Exception]]:
+    """Async variant of :func:`get_flights_from_filter_batch`."""
+    responses = await fallback_playwright_fetch_batch_async(
+        [_build_params(filter, currency) for filter in filters], timeout
+    )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _parse_batch, responses, filters, currency)
 
 
 def get_flights(
@@ -64,6 +616,11 @@ def get_flights(
     seat: Literal["economy", "premium-economy", "business", "first"],
     fetch_mode: Literal["common", "fallback", "force-fallback", "local"] = "common",
     max_stops: Optional[int] = None,
+    retry: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
 ) -> Result:
     return get_flights_from_filter(
         TFSData.from_interface(
@@ -74,40 +631,202 @@ def get_flights(
             max_stops=max_stops,
         ),
         mode=fetch_mode,
+        retry=retry,
+        hedge=hedge,
+        timeout=timeout,
+        stream=stream,
+        parser=parser,
     )
 
 
-def parse_response(
-    r: Response, *, dangerously_allow_looping_last_item: bool = False
+async def get_flights_async(
+    *,
+    flight_data: List[FlightData],
+    trip: Literal["round-trip", "one-way", "multi-city"],
+    passengers: Passengers,
+    seat: Literal["economy", "premium-economy", "business", "first"],
+    fetch_mode: Literal["common", "fallback", "force-fallback", "local"] = "common",
+    max_stops: Optional[int] = None,
+    retry: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
 ) -> Result:
-    class _blank:
-        def text(self, *_, **__):
-            return ""
+    """Async variant of :func:`get_flights`."""
+    return await get_flights_from_filter_async(
+        TFSData.from_interface(
+            flight_data=flight_data,
+            trip=trip,
+            passengers=passengers,
+            seat=seat,
+            max_stops=max_stops,
+        ),
+        mode=fetch_mode,
+        retry=retry,
+        hedge=hedge,
+        timeout=timeout,
+        stream=stream,
+        parser=parser,
+    )
+
 
-        def iter(self):
-            return []
+def get_flights_iter(
+    *,
+    flight_data: List[FlightData],
+    trip: Literal["round-trip", "one-way", "multi-city"],
+    passengers: Passengers,
+    seat: Literal["economy", "premium-economy", "business", "first"],
+    fetch_mode: Literal["common", "fallback", "force-fallback", "local"] = "common",
+    max_stops: Optional[int] = None,
+    retry: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
+) -> Iterator[Flight]:
+    """Iterator variant of :func:`get_flights` (see :func:`get_flights_from_filter_iter`)."""
+    return get_flights_from_filter_iter(
+        TFSData.from_interface(
+            flight_data=flight_data,
+            trip=trip,
+            passengers=passengers,
+            seat=seat,
+            max_stops=max_stops,
+        ),
+        mode=fetch_mode,
+        retry=retry,
+        hedge=hedge,
+        timeout=timeout,
+        stream=stream,
+        parser=parser,
+    )
 
-    blank = _blank()
 
-    def safe(n: Optional[LexborNode]):
-        return n or blank
+async def get_flights_iter_async(
+    *,
+    flight_data: List[FlightData],
+    trip: Literal["round-trip", "one-way", "multi-city"],
+    passengers: Passengers,
+    seat: Literal["economy", "premium-economy", "business", "first"],
+    fetch_mode: Literal["common", "fallback", "force-fallback", "local"] = "common",
+    max_stops: Optional[int] = None,
+    retry: Optional[RetryPolicy] = None,
+    hedge: bool = False,
+    timeout: Optional[float] = None,
+    stream: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
+) -> Iterator[Flight]:
+    """Async variant of :func:`get_flights_iter`."""
+    return await get_flights_from_filter_iter_async(
+        TFSData.from_interface(
+            flight_data=flight_data,
+            trip=trip,
+            passengers=passengers,
+            seat=seat,
+            max_stops=max_stops,
+        ),
+        mode=fetch_mode,
+        retry=retry,
+        hedge=hedge,
+        timeout=timeout,
+        stream=stream,
+        parser=parser,
+    )
 
-    parser = LexborHTMLParser(r.text)
-    flights = []
 
-    for i, fl in enumerate(parser.css('div[jsname="IWWDBc"], div[jsname="YdtKid"]')):
+_CONTAINERS = 'div[jsname="IWWDBc"], div[jsname="YdtKid"]'
+_ITEMS = "ul.Rk10dc li"
+_FIELD_SELECTORS = (
+    ("name", "div.sSHqwe.tPgKwe.ogfYpf span"),
+    ("times", "span.mv1WYe div"),
+    ("time_ahead", "span.bOzv6"),
+    ("duration", "li div.Ak5kof div"),
+    ("stops", ".BbR8Ec .ogfYpf"),
+    ("delay", ".GsCCve"),
+    ("price", ".YMlIz.FpEdX"),
+)
+_FIELDS = ", ".join(selector for _, selector in _FIELD_SELECTORS)
+
+
+def _field_index(container: LexborNode) -> Dict[int, Tuple[str, ...]]:
+    """Map each field node in a results container to the fields it can fill.
+
+    Built per container rather than per page, so markup outside the results
+    (which untrimmed pages are mostly made of) is never searched.
+    """
+    index: Dict[int, Tuple[str, ...]] = {}
+    for field, selector in _FIELD_SELECTORS:
+        for node in container.css(selector):
+            index[node.mem_id] = index.get(node.mem_id, ()) + (field,)
+    return index
+
+
+def _item_fields(item: LexborNode, index: Dict[int, Tuple[str, ...]]) -> dict:
+    """Collect the first node for each field (every node for ``times``).
+
+    Walks the item's subtree once with all field selectors combined; the
+    container's index tells which selector each match came from.
+    """
+    fields: dict = {"times": []}
+    seen = set()
+    for node in item.css(_FIELDS):
+        node_id = node.mem_id
+        # A node matching several selectors is returned once per match
+        if node_id in seen:
+            continue
+        seen.add(node_id)
+        for field in index.get(node_id, ()):
+            if field == "times":
+                fields["times"].append(node)
+            elif field not in fields:
+                fields[field] = node
+    return fields
+
+
+def _text(
+    fields: dict, field: str, counts: Optional[dict] = None, **kwargs
+) -> str:
+    node = fields.get(field)
+    if node is None:
+        if counts is not None:
+            counts[field]["missing"] += 1
+        return ""
+    text = node.text(**kwargs)
+    if counts is not None:
+        counts[field]["matched" if text else "empty"] += 1
+    return text
+
+
+def _dom_flights(
+    doc: LexborHTMLParser,
+    *,
+    currency: str,
+    query_date: Optional[datetime.date],
+    dangerously_allow_looping_last_item: bool,
+    report: Optional[ParseReport] = None,
+) -> Iterator[Flight]:
+    query_date = query_date or datetime.date.today()
+    counts = None
+    if report is not None:
+        counts = report.fields
+        for field, _ in _FIELD_SELECTORS:
+            counts[field] = dict.fromkeys(OUTCOMES, 0)
+
+    for i, fl in enumerate(doc.css(_CONTAINERS)):
         is_best_flight = i == 0
+        index = _field_index(fl)
 
-        for item in fl.css("ul.Rk10dc li")[
+        for item in fl.css(_ITEMS)[
             : (None if dangerously_allow_looping_last_item or i == 0 else -1)
         ]:
+            fields = _item_fields(item, index)
+
             # Flight name
-            name = safe(item.css_first("div.sSHqwe.tPgKwe.ogfYpf span")).text(
-                strip=True
-            )
+            name = _text(fields, "name", counts, strip=True)
 
             # Get departure & arrival time
-            dp_ar_node = item.css("span.mv1WYe div")
+            dp_ar_node = fields["times"]
             try:
                 departure_time = dp_ar_node[0].text(strip=True)
                 arrival_time = dp_ar_node[1].text(strip=True)
@@ -115,44 +834,183 @@ def parse_response(
                 # sometimes this is not present
                 departure_time = ""
                 arrival_time = ""
+            if counts is not None:
+                counts["times"][
+                    "missing"
+                    if len(dp_ar_node) < 2
+                    else "matched"
+                    if departure_time and arrival_time
+                    else "empty"
+                ] += 1
 
             # Get arrival time ahead
-            time_ahead = safe(item.css_first("span.bOzv6")).text()
+            time_ahead = _text(fields, "time_ahead", counts)
 
             # Get duration
-            duration = safe(item.css_first("li div.Ak5kof div")).text()
+            duration = _text(fields, "duration", counts)
 
             # Get flight stops
-            stops = safe(item.css_first(".BbR8Ec .ogfYpf")).text()
+            stops = _text(fields, "stops", counts)
 
             # Get delay
-            delay = safe(item.css_first(".GsCCve")).text() or None
+            delay = _text(fields, "delay", counts)
+            delay = sys.intern(delay) if delay else None
 
             # Get prices
-            price = safe(item.css_first(".YMlIz.FpEdX")).text() or "0"
+            price = _text(fields, "price", counts) or "0"
 
             # Stops formatting
             try:
                 stops_fmt = 0 if stops == "Nonstop" else int(stops.split(" ", 1)[0])
             except ValueError:
-                stops_fmt = "Unknown"
-
-            flights.append(
-                {
-                    "is_best": is_best_flight,
-                    "name": name,
-                    "departure": " ".join(departure_time.split()),
-                    "arrival": " ".join(arrival_time.split()),
-                    "arrival_time_ahead": time_ahead,
-                    "duration": duration,
-                    "stops": stops_fmt,
-                    "delay": delay,
-                    "price": price.replace(",", ""),
-                }
+                stops_fmt = None
+
+            # Numeric fields
+            if price == "0":
+                price_minor, price_currency = None, currency or None
+            else:
+                price_minor, price_currency = parse_price(price, currency)
+            departure_at = parse_clock(departure_time, query_date)
+            arrival_at = parse_clock(
+                arrival_time, departure_at.date() if departure_at else query_date
+            )
+
+            yield Flight(
+                is_best=is_best_flight,
+                # These repeat across flights and pages, so share one copy
+                name=sys.intern(name),
+                departure=sys.intern(" ".join(departure_time.split())),
+                arrival=sys.intern(" ".join(arrival_time.split())),
+                arrival_time_ahead=sys.intern(time_ahead),
+                duration=sys.intern(duration),
+                stops=stops_fmt,
+                delay=delay,
+                price=price.replace(",", ""),
+                price_minor=price_minor,
+                currency=price_currency,
+                duration_minutes=parse_duration(duration),
+                departure_at=departure_at,
+                arrival_at=arrival_at,
             )
 
-    current_price = safe(parser.css_first("span.gOatQ")).text()
+
+def iter_flights(
+    r: Response,
+    *,
+    dangerously_allow_looping_last_item: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
+    currency: str = "",
+    trim: bool = True,
+    query_date: Optional[datetime.date] = None,
+) -> Iterator[Flight]:
+    """Yield the flights on a results page one at a time.
+
+    Takes the same options as :func:`parse_response`, but parses each flight
+    only when it is requested, so callers that stop early never build the
+    rest. Yields nothing when the page has no flights. The embedded parser
+    falls back to the DOM parser only if it fails before its first flight.
+    """
+    if parser == "embedded":
+        payload = extract_payload(r.text)
+        if payload is not None:
+            embedded = iter_embedded_flights(payload, currency or page_currency(r.text))
+            try:
+                first = next(embedded, None)
+            except RuntimeError:
+                first = None
+            if first is not None:
+                yield first
+                yield from embedded
+                return
+
+    yield from _dom_flights(
+        LexborHTMLParser(trim_to_results(r.text) if trim else r.text),
+        currency=currency,
+        query_date=query_date,
+        dangerously_allow_looping_last_item=dangerously_allow_looping_last_item,
+    )
+
+
+def parse_response(
+    r: Response,
+    *,
+    dangerously_allow_looping_last_item: bool = False,
+    parser: Literal["dom", "embedded"] = "dom",
+    currency: str = "",
+    trim: bool = True,
+    query_date: Optional[datetime.date] = None,
+) -> Result:
+    """Parse a results page.
+
+    ``parser="embedded"`` decodes the JSON data embedded in the page instead
+    of scraping the markup, which is cheaper and fills ``Flight.segments``;
+    pages without usable embedded data fall back to the DOM parser.
+
+    Besides the display strings, each ``Flight`` carries the price in minor
+    units with its ISO currency, the duration in minutes and departure and
+    arrival datetimes. ``currency`` is the requested ``curr`` (otherwise it is
+    inferred from the price symbol) and ``query_date`` is the searched date,
+    used to infer the year the page leaves out (defaults to today).
+
+    With ``trim=True`` the DOM parser only builds a tree for the results
+    region of the page (see :mod:`fast_flights.trim`).
+
+    Each call reports its timing and, for the DOM parser, how often each
+    field's selector matched to the parse metrics sink (see
+    :mod:`fast_flights.metrics`).
+    """
+    report = ParseReport(parser=parser)
+    started_at = time.perf_counter()
+    try:
+        return _parse_page(
+            r,
+            report,
+            dangerously_allow_looping_last_item=dangerously_allow_looping_last_item,
+            currency=currency,
+            trim=trim,
+            query_date=query_date,
+        )
+    except Exception as e:
+        # The "No flights found" message carries the whole page
+        report.error = str(e).partition(":")[0] or type(e).__name__
+        raise
+    finally:
+        report.seconds = time.perf_counter() - started_at
+        get_parse_metrics().record(report)
+
+
+def _parse_page(
+    r: Response,
+    report: ParseReport,
+    *,
+    dangerously_allow_looping_last_item: bool,
+    currency: str,
+    trim: bool,
+    query_date: Optional[datetime.date],
+) -> Result:
+    if report.parser == "embedded":
+        try:
+            result = parse_embedded(r.text, currency)
+            report.flights = len(result.flights)
+            return result
+        except RuntimeError:
+            report.parser, report.fallback = "dom", True
+
+    doc = LexborHTMLParser(trim_to_results(r.text) if trim else r.text)
+    flights = list(
+        _dom_flights(
+            doc,
+            currency=currency,
+            query_date=query_date,
+            dangerously_allow_looping_last_item=dangerously_allow_looping_last_item,
+            report=report,
+        )
+    )
+    report.flights = len(flights)
+
+    current_price = doc.css_first("span.gOatQ")
+    current_price = sys.intern(current_price.text()) if current_price is not None else ""
     if not flights:
         raise RuntimeError("No flights found:\n{}".format(r.text_markdown))
 
-    return Result(current_price=current_price, flights=[Flight(**fl) for fl in flights])  # type: ignore
+    return Result(current_price=current_price, flights=flights)  # type: ignore
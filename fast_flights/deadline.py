@@ -0,0 +1,52 @@
+"""Time budgets propagated from the caller down to fetch and parse."""
+
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a query cannot finish within its time budget."""
+
+
+class Deadline:
+    """An absolute point in time (``time.monotonic()`` based).
+
+    Args:
+        timeout (float): Seconds from now until the deadline.
+    """
+
+    __slots__ = ("at",)
+
+    def __init__(self, timeout: float):
+        self.at = time.monotonic() + timeout
+
+    @staticmethod
+    def after(timeout: Optional[float]) -> "Optional[Deadline]":
+        """A deadline ``timeout`` seconds from now, or ``None`` for no limit."""
+        return None if timeout is None else Deadline(timeout)
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def check(self) -> None:
+        """Raise ``DeadlineExceeded`` if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceeded("Deadline exceeded")
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+
+def remaining(deadline: Optional[Deadline]) -> Optional[float]:
+    """Seconds left on ``deadline`` (``None`` means unlimited).
+
+    Raises ``DeadlineExceeded`` if no time is left.
+    """
+    if deadline is None:
+        return None
+    deadline.check()
+    return deadline.remaining()
@@ -0,0 +1,163 @@
+"""Parse the result data Google embeds in ``AF_initDataCallback`` scripts.
+
+The results page carries its flight list as JSON in the ``ds:1`` data
+callback. Decoding it skips building a DOM and yields fields the markup does
+not show (segments, flight numbers and exact times). Any deviation from the
+expected layout raises ``RuntimeError`` so callers can fall back to the DOM
+parser.
+"""
+
+import datetime
+import json
+import re
+import sys
+from typing import Any, Iterator, List, Optional
+
+from .normalize import currency_symbol, parse_price, to_minor
+from .schema import Flight, Result, Segment
+
+_CALLBACK = "AF_initDataCallback({key: 'ds:1'"
+_DECODER = json.JSONDecoder()
+# The price indicator ("low" / "typical" / "high") is only in the markup
+_CURRENT_PRICE = re.compile(r'<span class="gOatQ"[^>]*>([^<]*)<')
+# The payload holds bare amounts; their currency is only shown in the markup
+_DISPLAYED_PRICE = re.compile(r'class="YMlIz FpEdX[^"]*"[^>]*>(?:\s*<[^>]+>)*\s*([^<]+)<')
+
+# Payload layout: ``payload[2]`` holds the best flights and ``payload[3]`` the
+# others, each as ``[entries, ...]``. An entry is ``[itinerary, [[_, price]]]``.
+_BEST, _OTHER = 2, 3
+# Itinerary fields
+_AIRLINES, _SEGMENTS, _TOTAL_DURATION = 1, 2, 9
+# Segment fields
+_SEG_FROM, _SEG_FROM_NAME, _SEG_TO_NAME, _SEG_TO = 3, 4, 5, 6
+_SEG_DEP_TIME, _SEG_ARR_TIME, _SEG_DURATION = 8, 10, 11
+_SEG_AIRCRAFT, _SEG_DEP_DATE, _SEG_ARR_DATE, _SEG_FLIGHT = 17, 20, 21, 22
+
+
+def extract_payload(html: str) -> Optional[list]:
+    """Find and decode the ``ds:1`` payload, or ``None`` if it is missing."""
+    start = html.find(_CALLBACK)
+    if start == -1:
+        return None
+    data = html.find("data:", start)
+    if data == -1:
+        return None
+    try:
+        payload, _ = _DECODER.raw_decode(html, data + len("data:"))
+    except ValueError:
+        return None
+    return payload if isinstance(payload, list) else None
+
+
+def _moment(date: List[int], clock: List[Optional[int]]) -> datetime.datetime:
+    hour, minute = (list(clock) + [0, 0])[:2]
+    return datetime.datetime(date[0], date[1], date[2], hour or 0, minute or 0)
+
+
+def _clock(moment: datetime.datetime) -> str:
+    # Same wording as the results page, e.g. "6:05 PM on Mon, Nov 3"
+    return f"{moment.strftime('%I:%M %p').lstrip('0')} on {moment.strftime('%a, %b')} {moment.day}"
+
+
+def _duration(minutes: int) -> str:
+    hours, minutes = divmod(minutes, 60)
+    if not hours:
+        return f"{minutes} min"
+    return f"{hours} hr {minutes} min" if minutes else f"{hours} hr"
+
+
+def _segment(raw: list) -> Segment:
+    flight = raw[_SEG_FLIGHT] or []
+    return Segment(
+        from_airport=sys.intern(raw[_SEG_FROM]),
+        from_airport_name=sys.intern(raw[_SEG_FROM_NAME]),
+        to_airport=sys.intern(raw[_SEG_TO]),
+        to_airport_name=sys.intern(raw[_SEG_TO_NAME]),
+        departure=_moment(raw[_SEG_DEP_DATE], raw[_SEG_DEP_TIME]),
+        arrival=_moment(raw[_SEG_ARR_DATE], raw[_SEG_ARR_TIME]),
+        duration=raw[_SEG_DURATION],
+        airline=sys.intern(flight[3]) if len(flight) > 3 and flight[3] else "",
+        flight_number=" ".join(str(part) for part in flight[:2] if part),
+        aircraft=sys.intern(raw[_SEG_AIRCRAFT]) if raw[_SEG_AIRCRAFT] else None,
+    )
+
+
+def _flight(entry: list, is_best: bool, currency: str) -> Flight:
+    itinerary = entry[0]
+    price: Optional[int] = entry[1][0][1] if entry[1] else None
+    segments = [_segment(raw) for raw in itinerary[_SEGMENTS]]
+    departure, arrival = segments[0].departure, segments[-1].arrival
+    ahead = (arrival.date() - departure.date()).days
+    symbol = currency_symbol(currency)
+
+    return Flight(
+        is_best=is_best,
+        name=sys.intern(", ".join(itinerary[_AIRLINES])),
+        departure=sys.intern(_clock(departure)),
+        arrival=sys.intern(_clock(arrival)),
+        arrival_time_ahead=sys.intern(f"+{ahead}") if ahead > 0 else "",
+        duration=sys.intern(_duration(itinerary[_TOTAL_DURATION])),
+        stops=len(segments) - 1,
+        delay=None,
+        price="0" if price is None else f"{symbol}{price}",
+        price_minor=None if price is None else to_minor(price, currency),
+        currency=currency or None,
+        duration_minutes=itinerary[_TOTAL_DURATION],
+        departure_at=departure,
+        arrival_at=arrival,
+        segments=segments,
+    )
+
+
+def page_currency(html: str) -> str:
+    """The ISO currency of the first price displayed on ``html``, or ``""``.
+
+    Used when no ``curr`` was requested: the amount's minor digits depend on
+    the currency Google picked (e.g. none for KRW).
+    """
+    match = _DISPLAYED_PRICE.search(html)
+    if match is None:
+        return ""
+    return parse_price(match.group(1))[1] or ""
+
+
+def iter_embedded_flights(payload: list, currency: str = "") -> Iterator[Flight]:
+    """Yield flights from a decoded payload one at a time.
+
+    Raises ``RuntimeError`` at the first entry that is not laid out as
+    expected.
+    """
+    try:
+        for index in (_BEST, _OTHER):
+            section: Any = payload[index] if len(payload) > index else None
+            for entry in (section or [None])[0] or []:
+                yield _flight(entry, index == _BEST, currency)
+    except (IndexError, KeyError, TypeError, ValueError) as e:
+        raise RuntimeError(f"Unexpected embedded flight data: {e!r}") from e
+
+
+def parse_embedded(html: str, currency: str = "") -> Result:
+    """Build a ``Result`` from the embedded payload alone.
+
+    Args:
+        html (str): The results page.
+        currency (str): Currency requested with ``curr``. The payload holds
+            bare amounts, so this is what ``Flight.currency`` reports; when
+            empty, it is inferred from the prices shown on the page.
+
+    Raises ``RuntimeError`` if the payload is missing or not laid out as
+    expected.
+    """
+    payload = extract_payload(html)
+    if payload is None:
+        raise RuntimeError("No embedded flight data found")
+
+    flights = list(iter_embedded_flights(payload, currency or page_currency(html)))
+    if not flights:
+        raise RuntimeError("No flights in embedded data")
+
+    current_price = _CURRENT_PRICE.search(html)
+    return Result(
+        current_price=sys.intern(current_price.group(1)) if current_price else "",  # type: ignore
+        flights=flights,
+    )
@@ -1,16 +1,53 @@
-from typing import Any
+import asyncio
+import json
+import os
+from typing import Any, List, Optional
+
+from .blocking import ALLOWED_HOSTS, BLOCKED_RESOURCE_TYPES
+from .deadline import Deadline, remaining
+from .pool import get_client_pool
+from .ratelimit import get_rate_limiter
+from .retry import StatusError
+from .transport import url_host
+
+RUN_ENDPOINT = "https://try.playwright.tech/service/control/run"
 
-from .primp import Client
 
-CODE = """\
+def run_endpoint() -> str:
+    """The remote Playwright run endpoint.
+
+    Defaults to ``FAST_FLIGHTS_RUN_ENDPOINT`` (e.g. a local stand-in, see
+    :mod:`fast_flights.standin`), then ``RUN_ENDPOINT``.
+    """
+    return os.environ.get("FAST_FLIGHTS_RUN_ENDPOINT") or RUN_ENDPOINT
+
+_PRELUDE = """\
 import asyncio
+import json
 import sys
+from urllib.parse import urlsplit
 from playwright.async_api import async_playwright
 
+BLOCKED_TYPES = %r
+ALLOWED_HOSTS = %r
+
+async def block(route):
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+    if request.resource_type in BLOCKED_TYPES or not any(
+        host == h or host.endswith("." + h) for h in ALLOWED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+"""
+
+CODE = _PRELUDE + """
 async def main():
     async with async_playwright() as p:
         browser = await p.chromium.launch()
         page = await browser.new_page()
+        await page.route("**/*", block)
         await page.goto("%s")
         locator = page.locator('.eQ35Ce')
         await locator.wait_for()
@@ -25,28 +62,140 @@ async def main():
 asyncio.run(main())
 """
 
+BATCH_CODE = _PRELUDE + """
+URLS = %r
+
+async def main():
+    bodies = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        await page.route("**/*", block)
+        for url in URLS:
+            try:
+                await page.goto(url)
+                locator = page.locator('.eQ35Ce')
+                await locator.wait_for()
+                bodies.append(
+                    await page.evaluate(
+                        \"\"\"() => {
+                            return document.querySelector('[role="main"]').innerHTML
+                        }\"\"\"
+                    )
+                )
+            except Exception:
+                bodies.append(None)
+        await browser.close()
+    sys.stdout.write(json.dumps(bodies))
+
+asyncio.run(main())
+"""
+
 
-def fallback_playwright_fetch(params: dict) -> Any:
-    client = Client(impersonate="chrome_100", verify=False)
-
-    res = client.post(
-        "https://try.playwright.tech/service/control/run",
-        json={
-            "code": CODE
-            % (
-                "https://www.google.com/travel/flights"
-                + "?"
-                + "&".join(f"{k}={v}" for k, v in params.items())
-            ),
-            "language": "python",
-        },
+def _flights_url(params: dict) -> str:
+    return (
+        "https://www.google.com/travel/flights"
+        + "?"
+        + "&".join(f"{k}={v}" for k, v in params.items())
     )
-    assert res.status_code == 200, f"{res.status_code} Result: {res.text_markdown}"
-    import json
 
+
+def _dummy_response(body: str) -> Any:
     class DummyResponse:
         status_code = 200
-        text = json.loads(res.text)["output"]
+        text = body
         text_markdown = text
 
     return DummyResponse
+
+
+def _run_code(code: str, timeout: Optional[float] = None) -> str:
+    kwargs = {} if timeout is None else {"timeout": timeout}
+    with get_client_pool().client("chrome_100") as client:
+        res = client.post(
+            run_endpoint(),
+            json={"code": code, "language": "python"},
+            **kwargs,
+        )
+    if res.status_code != 200:
+        raise StatusError(res.status_code, res.text_markdown)
+
+    return json.loads(res.text)["output"]
+
+
+def _run(params: dict, timeout: Optional[float] = None) -> Any:
+    output = _run_code(
+        CODE
+        % (
+            tuple(sorted(BLOCKED_RESOURCE_TYPES)),
+            ALLOWED_HOSTS,
+            _flights_url(params),
+        ),
+        timeout,
+    )
+    return _dummy_response(output)
+
+
+def _run_batch(
+    params_list: List[dict], timeout: Optional[float] = None
+) -> List[Optional[Any]]:
+    output = _run_code(
+        BATCH_CODE
+        % (
+            tuple(sorted(BLOCKED_RESOURCE_TYPES)),
+            ALLOWED_HOSTS,
+            [_flights_url(params) for params in params_list],
+        ),
+        timeout,
+    )
+    bodies = json.loads(output)
+    if len(bodies) != len(params_list):
+        raise RuntimeError(
+            f"Expected {len(params_list)} bodies from the batch run, got {len(bodies)}"
+        )
+
+    return [None if body is None else _dummy_response(body) for body in bodies]
+
+
+def fallback_playwright_fetch(params: dict, timeout: Optional[float] = None) -> Any:
+    deadline = Deadline.after(timeout)
+    get_rate_limiter().acquire(url_host(run_endpoint()), "fallback", remaining(deadline))
+    return _run(params, remaining(deadline))
+
+
+async def fallback_playwright_fetch_async(
+    params: dict, timeout: Optional[float] = None
+) -> Any:
+    deadline = Deadline.after(timeout)
+    await get_rate_limiter().acquire_async(
+        url_host(run_endpoint()), "fallback", remaining(deadline)
+    )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _run, params, remaining(deadline))
+
+
+def fallback_playwright_fetch_batch(
+    params_list: List[dict], timeout: Optional[float] = None
+) -> List[Optional[Any]]:
+    """Fetch several queries with a single remote browser run.
+
+    Returns one response per entry in ``params_list``, or ``None`` where the
+    page could not be loaded. ``timeout`` bounds the whole run, including the
+    rate-limit wait.
+    """
+    deadline = Deadline.after(timeout)
+    get_rate_limiter().acquire(url_host(run_endpoint()), "fallback", remaining(deadline))
+    return _run_batch(params_list, remaining(deadline))
+
+
+async def fallback_playwright_fetch_batch_async(
+    params_list: List[dict], timeout: Optional[float] = None
+) -> List[Optional[Any]]:
+    deadline = Deadline.after(timeout)
+    await get_rate_limiter().acquire_async(
+        url_host(run_endpoint()), "fallback", remaining(deadline)
+    )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, _run_batch, params_list, remaining(deadline)
+    )
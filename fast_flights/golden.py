@@ -0,0 +1,304 @@
+"""Golden-fixture checks for ``parse_response``.
+
+A fixture directory holds result pages as ``<name>.html`` next to a
+``golden.json`` recording what each parser extracted from them: the flight
+count, a digest of the flights and how often each field was filled in.
+``check`` re-parses every page, reports latency, peak memory and field
+completeness per fixture, and fails when the output drifts from the golden
+record::
+
+    python -m fast_flights.golden build fixtures/ --cassettes cassettes/
+    python -m fast_flights.golden check fixtures/
+
+``build`` writes stand-in pages for the common page shapes (one-way,
+round-trip, multi-city, no results and the consent interstitial, and a KRW
+page parsed with and without a requested currency) plus any
+recorded pages from a cassette directory. Rebuild after an intended parser
+change.
+
+The stand-in pages are rendered from this package's own idea of the markup,
+so they only catch changes to the parser; they cannot detect Google changing
+its markup. Only recorded pages, re-recorded from time to time, can.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .benchmark import bench_parse
+from .core import parse_response
+from .flights_impl import FlightData, Passengers, TFSData
+from .schema import Flight
+from .standin import decode_tfs, render_page
+from .transport import _cassette_response
+
+GOLDEN = "golden.json"
+PARSERS = ("dom", "embedded")
+# Fields every flight on a well-formed page should have
+COMPLETENESS_FIELDS = (
+    "name",
+    "departure",
+    "arrival",
+    "duration",
+    "stops",
+    "price",
+    "price_minor",
+    "duration_minutes",
+    "departure_at",
+    "arrival_at",
+)
+# What Google serves instead of results when cookies have not been accepted
+CONSENT_PAGE = (
+    "<!DOCTYPE html><html><head><title>Before you continue to Google</title></head>"
+    '<body><form action="https://consent.google.com/save" method="POST">'
+    "<h1>Before you continue to Google</h1>"
+    '<button aria-label="Accept all">Accept all</button>'
+    '<button aria-label="Reject all">Reject all</button>'
+    "</form></body></html>"
+)
+
+
+def _info(trip: str, legs: List[tuple]):
+    return TFSData.from_interface(
+        flight_data=[
+            FlightData(date=date, from_airport=origin, to_airport=destination)
+            for date, origin, destination in legs
+        ],
+        trip=trip,  # type: ignore
+        passengers=Passengers(adults=1),
+        seat="economy",
+    ).pb()
+
+
+def standin_fixtures(padding: int = 16 * 1024) -> Dict[str, dict]:
+    """Stand-in pages for each page shape, as ``{name: fixture}``."""
+    one_way = _info("one-way", [("2025-03-01", "ICN", "NRT")])
+    round_trip = _info(
+        "round-trip", [("2025-03-01", "ICN", "NRT"), ("2025-03-08", "NRT", "ICN")]
+    )
+    multi_city = _info(
+        "multi-city", [("2025-03-01", "ICN", "NRT"), ("2025-03-05", "NRT", "SFO")]
+    )
+    no_results = render_page(one_way, "USD", padding=padding)
+    main = no_results.index('<div role="main">') + len('<div role="main">')
+    no_results = no_results[:main] + "<p>No results returned.</p></div></body></html>"
+
+    krw = render_page(one_way, "KRW", padding=padding)
+
+    # ``(page, currency requested with it)``; ``""`` leaves the currency to
+    # be inferred from the page
+    pages = {
+        "one-way": (render_page(one_way, "USD", padding=padding), "USD"),
+        "round-trip": (render_page(round_trip, "USD", padding=padding), "USD"),
+        "multi-city": (render_page(multi_city, "USD", padding=padding), "USD"),
+        "one-way-krw": (krw, "KRW"),
+        "one-way-krw-nocurr": (krw, ""),
+        "no-results": (no_results, "USD"),
+        "consent": (CONSENT_PAGE, "USD"),
+    }
+    return {
+        name: {"text": text, "currency": currency, "query_date": "2025-03-01"}
+        for name, (text, currency) in pages.items()
+    }
+
+
+def cassette_fixtures(directory: str) -> Dict[str, dict]:
+    """Recorded pages from a cassette directory, as ``{name: fixture}``."""
+    fixtures = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            cassette = json.load(f)
+        if cassette["status_code"] != 200:
+            continue
+        params = cassette.get("params", {})
+        try:
+            query_date: Optional[str] = decode_tfs(params["tfs"]).data[0].date
+        except Exception:
+            query_date = None
+        fixtures[f"recorded-{path.stem[:12]}"] = {
+            "text": cassette["text"],
+            "currency": params.get("curr", ""),
+            "query_date": query_date,
+        }
+    return fixtures
+
+
+def _filled(flight: Flight, field: str) -> bool:
+    value = getattr(flight, field)
+    return value is not None and value != "" and not (field == "price" and value == "0")
+
+
+def summarize(flights: List[Flight]) -> dict:
+    """Flight count, digest and per-field completeness of a parse."""
+    digest = hashlib.sha1()
+    for flight in flights:
+        digest.update(
+            repr(
+                (
+                    flight.is_best,
+                    flight.name,
+                    flight.departure,
+                    flight.arrival,
+                    flight.price,
+                    flight.price_minor,
+                    flight.currency,
+                )
+            ).encode("utf-8")
+        )
+    return {
+        "flights": len(flights),
+        "best": sum(flight.is_best for flight in flights),
+        "digest": digest.hexdigest(),
+        "completeness": {
+            field: round(sum(_filled(f, field) for f in flights) / len(flights), 4)
+            if flights
+            else 0.0
+            for field in COMPLETENESS_FIELDS
+        },
+    }
+
+
+def _query_date(fixture: dict) -> Optional[datetime.date]:
+    date = fixture.get("query_date")
+    return datetime.date.fromisoformat(date) if date else None
+
+
+def parse_entry(text: str, fixture: dict, parser: str) -> dict:
+    """Summarize ``parser``'s output on ``text``, parsed with the currency and
+    query date recorded in ``fixture``, or ``{"error": ...}`` if it fails."""
+    try:
+        result = parse_response(
+            _cassette_response(200, text),
+            parser=parser,  # type: ignore
+            currency=fixture.get("currency", ""),
+            query_date=_query_date(fixture),
+        )
+    except RuntimeError as e:
+        return {"error": type(e).__name__}
+    return summarize(result.flights)
+
+
+def build(directory: str, fixtures: Dict[str, dict]) -> dict:
+    """Write ``fixtures`` to ``directory`` with a fresh ``golden.json``."""
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    golden = {}
+    for name, fixture in sorted(fixtures.items()):
+        path = root / f"{name}.html"
+        path.write_text(fixture["text"], encoding="utf-8")
+        golden[name] = {
+            "file": path.name,
+            "currency": fixture.get("currency", ""),
+            "query_date": fixture.get("query_date"),
+            "parsers": {parser: parse_entry(fixture["text"], fixture, parser) for parser in PARSERS},
+        }
+    with open(root / GOLDEN, "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return golden
+
+
+def regressions(expected: dict, actual: dict) -> List[str]:
+    """How ``actual`` (from :func:`parse_entry`) falls short of ``expected``;
+    empty when it matches the golden record."""
+    if "error" in expected or "error" in actual:
+        before, after = expected.get("error", "flights"), actual.get("error", "flights")
+        return [f"outcome {before} -> {after}"] if before != after else []
+
+    problems = []
+    if actual["flights"] != expected["flights"]:
+        problems.append(f"flights {expected['flights']} -> {actual['flights']}")
+    elif actual["digest"] != expected["digest"]:
+        problems.append("flight contents changed")
+    for field, ratio in expected["completeness"].items():
+        if actual["completeness"].get(field, 0.0) < ratio:
+            problems.append(f"{field} filled {ratio:.0%} -> {actual['completeness'][field]:.0%}")
+    return problems
+
+
+def check(directory: str, *, repeat: int = 20, max_ms: Optional[float] = None) -> List[dict]:
+    """Re-parse every fixture in ``directory`` against its golden record.
+
+    Args:
+        directory (str): A directory written by :func:`build`.
+        repeat (int): Timed parses per fixture and parser.
+        max_ms (float): Optional p95 latency budget per page.
+
+    Returns one row per fixture and parser; rows with a non-empty
+    ``regressions`` list failed.
+    """
+    root = Path(directory)
+    with open(root / GOLDEN, encoding="utf-8") as f:
+        golden = json.load(f)
+
+    rows = []
+    for name, entry in sorted(golden.items()):
+        text = (root / entry["file"]).read_text(encoding="utf-8")
+        for parser, expected in entry["parsers"].items():
+            actual = parse_entry(text, entry, parser)
+            timing = bench_parse(
+                [text],
+                lambda page: parse_entry(page, entry, parser),
+                repeat=repeat,
+            )
+            problems = regressions(expected, actual)
+            if max_ms is not None and timing["p95_ms"] > max_ms:
+                problems.append(f"p95 {timing['p95_ms']:.2f} ms over {max_ms} ms budget")
+            rows.append(
+                {
+                    "fixture": name,
+                    "parser": parser,
+                    "p50_ms": round(timing["p50_ms"], 3),
+                    "p95_ms": round(timing["p95_ms"], 3),
+                    "peak_kib": round(timing["peak_kib_per_page"], 1),
+                    "flights": actual.get("flights", 0),
+                    "completeness": actual.get("completeness", {}),
+                    "regressions": problems,
+                }
+            )
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Write fixtures and their golden records")
+    build_cmd.add_argument("directory")
+    build_cmd.add_argument("--cassettes", help="Also include recorded pages from here")
+    build_cmd.add_argument(
+        "--no-standin", action="store_true", help="Only include recorded pages"
+    )
+
+    check_cmd = commands.add_parser("check", help="Compare parser output with golden records")
+    check_cmd.add_argument("directory")
+    check_cmd.add_argument("--repeat", type=int, default=20)
+    check_cmd.add_argument("--max-ms", type=float, help="p95 latency budget per page")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        fixtures: Dict[str, Any] = {} if args.no_standin else standin_fixtures()
+        if args.cassettes:
+            fixtures.update(cassette_fixtures(args.cassettes))
+        golden = build(args.directory, fixtures)
+        print(f"Wrote {len(golden)} fixtures to {args.directory}")
+        return
+
+    rows = check(args.directory, repeat=args.repeat, max_ms=args.max_ms)
+    print(json.dumps(rows, indent=2))
+    failed = [row for row in rows if row["regressions"]]
+    if failed:
+        for row in failed:
+            print(
+                f"{row['fixture']} ({row['parser']}): {'; '.join(row['regressions'])}",
+                file=sys.stderr,
+            )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
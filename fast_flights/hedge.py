@@ -0,0 +1,166 @@
+"""Hedged requests: race a delayed duplicate against a slow request."""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Sliding window of request latencies.
+
+    Args:
+        window (int): Number of recent samples kept.
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The ``q`` quantile (0-1) of recorded latencies, or ``None`` if empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class Hedger:
+    """Issues a second request when the first outlives the p95 latency.
+
+    Args:
+        tracker (LatencyTracker): Latencies the hedge delay is derived from.
+        quantile (float): Latency quantile used as the hedge delay.
+        min_samples (int): Samples required before the quantile is trusted.
+        default_delay (float): Hedge delay used until then, in seconds.
+        min_delay (float): Lower bound for the hedge delay, in seconds.
+    """
+
+    def __init__(
+        self,
+        tracker: LatencyTracker,
+        *,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        default_delay: float = 3.0,
+        min_delay: float = 0.2,
+    ):
+        self.tracker = tracker
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self._executor = ThreadPoolExecutor(thread_name_prefix="fast-flights-hedge")
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def delay(self) -> float:
+        if len(self.tracker) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, self.tracker.percentile(self.quantile) or 0.0)
+
+    def _count(self, *, hedged: bool, hedge_won: bool) -> None:
+        with self._lock:
+            self._requests += 1
+            self._hedged += hedged
+            self._hedge_wins += hedge_won
+
+    def run(self, primary: Callable[[], T], hedge: Callable[[], T]) -> T:
+        """Run ``primary``; if it is still pending after ``delay()``, race ``hedge``."""
+        first = self._executor.submit(primary)
+        done, _ = wait([first], timeout=self.delay())
+        if done:
+            self._count(hedged=False, hedge_won=False)
+            return first.result()
+
+        second = self._executor.submit(hedge)
+        pending = {first, second}
+        winner: Optional[Future] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+            if winner is not None:
+                break
+
+        for future in pending:
+            future.cancel()
+
+        self._count(hedged=True, hedge_won=winner is second)
+        # Both failed: surface the primary's error
+        return (winner or first).result()
+
+    async def run_async(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Async variant of :meth:`run`."""
+        first = asyncio.ensure_future(primary())
+        done, _ = await asyncio.wait([first], timeout=self.delay())
+        if done:
+            self._count(hedged=False, hedge_won=False)
+            return first.result()
+
+        second = asyncio.ensure_future(hedge())
+        pending: Any = {first, second}
+        winner = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    break
+            if winner is not None:
+                break
+
+        for task in pending:
+            task.cancel()
+
+        for task in (first, second):
+            if task is not winner and task.done() and not task.cancelled():
+                task.exception()  # mark as retrieved
+
+        self._count(hedged=True, hedge_won=winner is second)
+        return (winner or first).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "hedge_rate": self._hedged / self._requests if self._requests else 0.0,
+                "win_rate": self._hedge_wins / self._hedged if self._hedged else 0.0,
+                "delay": self.delay(),
+            }
+
+
+_tracker = LatencyTracker()
+_hedger = Hedger(_tracker)
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the process-wide latency tracker for ``fetch``."""
+    return _tracker
+
+
+def get_hedger() -> Hedger:
+    """Get the process-wide hedger used by ``fetch(..., hedge=True)``."""
+    return _hedger
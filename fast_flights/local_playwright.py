@@ -1,29 +1,248 @@
-from typing import Any
+from typing import Any, List, Optional
 import asyncio
-from playwright.async_api import async_playwright
+import threading
+import time
+from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 
-async def fetch_with_playwright(url: str) -> str:
+from .blocking import ResourceFilter
+from .deadline import Deadline, DeadlineExceeded, remaining
+from .ratelimit import get_rate_limiter
+from .transport import flights_url, url_host
+
+def _ms(deadline: Optional[Deadline]) -> Optional[float]:
+    # Playwright takes milliseconds; None keeps its default timeout
+    left = remaining(deadline)
+    return None if left is None else left * 1000
+
+async def _read_results(page: Page, url: str, timeout: Optional[float] = None) -> str:
+    deadline = Deadline.after(timeout)
+    await page.goto(url, timeout=_ms(deadline))
+    if page.url.startswith("https://consent.google.com"):
+        await page.click('text="Accept all"', timeout=_ms(deadline))
+    locator = page.locator('.eQ35Ce')
+    await locator.wait_for(timeout=_ms(deadline))
+    # evaluate() takes no timeout, so a hung page is bounded here
+    left = remaining(deadline)
+    read = page.evaluate("() => document.querySelector('[role=\"main\"]').innerHTML")
+    if left is None:
+        return await read
+    try:
+        return await asyncio.wait_for(read, left)
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceeded("Deadline exceeded") from e
+
+async def fetch_with_playwright(
+    url: str, resource_filter: Optional[ResourceFilter] = None
+) -> str:
     async with async_playwright() as p:
         browser = await p.chromium.launch()
         page = await browser.new_page()
-        await page.goto(url)
-        if page.url.startswith("https://consent.google.com"):
-            await page.click('text="Accept all"')
-        locator = page.locator('.eQ35Ce')
-        await locator.wait_for()
-        body = await page.evaluate(
-            "() => document.querySelector('[role=\"main\"]').innerHTML"
-        )
+        await page.route("**/*", (resource_filter or ResourceFilter()).handle)
+        body = await _read_results(page, url)
         await browser.close()
     return body
 
-def local_playwright_fetch(params: dict) -> Any:
-    url = "https://www.google.com/travel/flights?" + "&".join(f"{k}={v}" for k, v in params.items())
-    body = asyncio.run(fetch_with_playwright(url))
+class _Slot:
+    __slots__ = ("browser_index", "context", "pages")
+
+    def __init__(self, browser_index: int):
+        self.browser_index = browser_index
+        self.context: Optional[BrowserContext] = None
+        self.pages = 0
+
+class BrowserPool:
+    """A long-lived pool of Chromium browsers for ``mode="local"``.
+
+    The pool runs ``browsers`` × ``contexts_per_browser`` contexts on its own
+    event loop thread, so both sync and async callers reuse warm browsers. A
+    context is recycled after ``max_pages_per_context`` pages or after an
+    error; a crashed browser is relaunched. Requests rejected by
+    ``resource_filter`` (images, fonts, third-party hosts, ...) are aborted.
+
+    Args:
+        browsers (int): Number of browser processes.
+        contexts_per_browser (int): Concurrent contexts per browser.
+        max_pages_per_context (int): Pages served before a context is recycled.
+        resource_filter (ResourceFilter, optional): Request filter for every
+            context. Defaults to ``ResourceFilter()``.
+    """
+
+    def __init__(
+        self,
+        *,
+        browsers: int = 1,
+        contexts_per_browser: int = 2,
+        max_pages_per_context: int = 50,
+        resource_filter: Optional[ResourceFilter] = None,
+    ):
+        self.browsers = browsers
+        self.contexts_per_browser = contexts_per_browser
+        self.max_pages_per_context = max_pages_per_context
+        self.resource_filter = resource_filter or ResourceFilter()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="fast-flights-browser-pool", daemon=True
+        )
+        self._thread.start()
+
+        self._playwright: Any = None
+        self._browsers: List[Optional[Browser]] = [None] * browsers
+        self._slots: "Optional[asyncio.Queue[_Slot]]" = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._pages = 0
+        self._load_seconds = 0.0
+        self._recycled = 0
+        self._relaunched = 0
+
+    async def _start(self) -> "asyncio.Queue[_Slot]":
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._slots is None:
+                self._playwright = await async_playwright().start()
+                slots: "asyncio.Queue[_Slot]" = asyncio.Queue()
+                for i in range(self.browsers):
+                    for _ in range(self.contexts_per_browser):
+                        slots.put_nowait(_Slot(i))
+                self._slots = slots
+        return self._slots
+
+    async def _browser(self, index: int) -> Browser:
+        browser = self._browsers[index]
+        if browser is None or not browser.is_connected():
+            if browser is not None:
+                self._relaunched += 1
+            browser = self._browsers[index] = await self._playwright.chromium.launch()
+        return browser
+
+    async def _recycle(self, slot: _Slot) -> None:
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+            self._recycled += 1
+        slot.context = None
+        slot.pages = 0
+
+    async def _fetch(self, url: str, timeout: Optional[float] = None) -> str:
+        deadline = Deadline.after(timeout)
+        slots = await self._start()
+        if deadline is None:
+            slot = await slots.get()
+        else:
+            slot = await asyncio.wait_for(slots.get(), deadline.remaining())
+        try:
+            if slot.context is None:
+                browser = await self._browser(slot.browser_index)
+                slot.context = await browser.new_context()
+                await slot.context.route("**/*", self.resource_filter.handle)
+
+            page = await slot.context.new_page()
+            started_at = time.monotonic()
+            try:
+                body = await _read_results(page, url, remaining(deadline))
+            finally:
+                await page.close()
 
+            slot.pages += 1
+            self._pages += 1
+            self._load_seconds += time.monotonic() - started_at
+            if slot.pages >= self.max_pages_per_context:
+                await self._recycle(slot)
+            return body
+
+        except BaseException:
+            # The context (or its browser) may be broken; start it fresh next time
+            await self._recycle(slot)
+            raise
+
+        finally:
+            slots.put_nowait(slot)
+
+    def fetch(self, url: str, timeout: Optional[float] = None) -> str:
+        return asyncio.run_coroutine_threadsafe(
+            self._fetch(url, timeout), self._loop
+        ).result()
+
+    async def fetch_async(self, url: str, timeout: Optional[float] = None) -> str:
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._fetch(url, timeout), self._loop)
+        )
+
+    async def _close(self) -> None:
+        for browser in self._browsers:
+            if browser is not None:
+                await browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+    def close(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def stats(self) -> dict:
+        return {
+            "pages": self._pages,
+            "avg_page_seconds": self._load_seconds / self._pages if self._pages else None,
+            "contexts_recycled": self._recycled,
+            "browsers_relaunched": self._relaunched,
+            "requests": self.resource_filter.stats(),
+        }
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    """Get (and lazily create) the process-wide browser pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+def configure_browser_pool(
+    *,
+    browsers: int = 1,
+    contexts_per_browser: int = 2,
+    max_pages_per_context: int = 50,
+    resource_filter: Optional[ResourceFilter] = None,
+) -> BrowserPool:
+    """Replace the process-wide browser pool with a freshly configured one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = BrowserPool(
+            browsers=browsers,
+            contexts_per_browser=contexts_per_browser,
+            max_pages_per_context=max_pages_per_context,
+            resource_filter=resource_filter,
+        )
+        return _pool
+
+def _flights_url(params: dict) -> str:
+    return flights_url() + "?" + "&".join(f"{k}={v}" for k, v in params.items())
+
+def _dummy_response(body: str) -> Any:
     class DummyResponse:
         status_code = 200
         text = body
         text_markdown = body
 
     return DummyResponse
+
+def local_playwright_fetch(params: dict, timeout: Optional[float] = None) -> Any:
+    deadline = Deadline.after(timeout)
+    url = _flights_url(params)
+    get_rate_limiter().acquire(url_host(url), "local", remaining(deadline))
+    body = get_browser_pool().fetch(url, remaining(deadline))
+    return _dummy_response(body)
+
+async def local_playwright_fetch_async(params: dict, timeout: Optional[float] = None) -> Any:
+    deadline = Deadline.after(timeout)
+    url = _flights_url(params)
+    await get_rate_limiter().acquire_async(url_host(url), "local", remaining(deadline))
+    body = await get_browser_pool().fetch_async(url, remaining(deadline))
+    return _dummy_response(body)
@@ -0,0 +1,103 @@
+"""Per-page parse metrics, for spotting markup drift and parser slowdowns.
+
+Every ``parse_response`` call produces one ``ParseReport`` and hands it to
+the process-wide ``ParseMetrics``. The default one keeps totals for
+``stats()``; to feed a dashboard, subclass it and override ``record``::
+
+    class StatsdMetrics(ParseMetrics):
+        def record(self, report):
+            super().record(report)
+            statsd.timing("flights.parse", report.seconds * 1000)
+            for field, outcomes in report.fields.items():
+                statsd.incr(f"flights.field.{field}.missing", outcomes["missing"])
+
+    set_parse_metrics(StatsdMetrics())
+
+A rising ``missing`` or ``empty`` count for a field means its selector no
+longer matches the page.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# A field's node was found and had text / was found but empty / was not
+# found, so the field kept its default (``""``, or ``"0"`` for the price)
+OUTCOMES = ("matched", "empty", "missing")
+
+
+@dataclass(slots=True)
+class ParseReport:
+    """What happened while parsing one page.
+
+    Args:
+        parser (str): The parser that produced the flights (``"dom"`` or
+            ``"embedded"``).
+        seconds (float): Wall time spent in ``parse_response``.
+        flights (int): Flights extracted.
+        fallback (bool): Whether the embedded parser failed and the DOM
+            parser was used instead.
+        error (str, optional): Why the page yielded no result, if it did not.
+        fields (dict): ``{field: {outcome: count}}`` over every flight item,
+            for the DOM parser only.
+    """
+
+    parser: str
+    seconds: float = 0.0
+    flights: int = 0
+    fallback: bool = False
+    error: Optional[str] = None
+    fields: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+class ParseMetrics:
+    """The default metrics sink: thread-safe running totals."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages: Dict[str, int] = {}
+        self._seconds: Dict[str, float] = {}
+        self._failed = 0
+        self._fallbacks = 0
+        self._fields: Dict[str, Dict[str, int]] = {}
+
+    def record(self, report: ParseReport) -> None:
+        with self._lock:
+            self._pages[report.parser] = self._pages.get(report.parser, 0) + 1
+            self._seconds[report.parser] = self._seconds.get(report.parser, 0.0) + report.seconds
+            self._failed += report.error is not None
+            self._fallbacks += report.fallback
+            for name, outcomes in report.fields.items():
+                totals = self._fields.setdefault(name, dict.fromkeys(OUTCOMES, 0))
+                for outcome, count in outcomes.items():
+                    totals[outcome] += count
+
+    def stats(self) -> dict:
+        """Page counts and mean parse time per parser, failures, embedded
+        fallbacks and per-field outcome counts."""
+        with self._lock:
+            return {
+                "pages": dict(self._pages),
+                "mean_ms": {
+                    parser: self._seconds[parser] / pages * 1e3
+                    for parser, pages in self._pages.items()
+                },
+                "failed": self._failed,
+                "fallbacks": self._fallbacks,
+                "fields": {name: dict(outcomes) for name, outcomes in self._fields.items()},
+            }
+
+
+_metrics = ParseMetrics()
+
+
+def get_parse_metrics() -> ParseMetrics:
+    """Get the process-wide sink that ``parse_response`` reports to."""
+    return _metrics
+
+
+def set_parse_metrics(metrics: ParseMetrics) -> ParseMetrics:
+    """Replace the process-wide metrics sink, returning the previous one."""
+    global _metrics
+    previous, _metrics = _metrics, metrics
+    return previous
@@ -0,0 +1,129 @@
+"""Turn the display strings of a results page into numbers and datetimes."""
+
+import datetime
+import re
+from typing import Optional, Tuple
+
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥", "KRW": "₩"}
+
+# Prefixes as rendered with ``hl=en``; longer ones must be tried first
+_SYMBOL_CURRENCIES = (
+    ("CA$", "CAD"),
+    ("A$", "AUD"),
+    ("HK$", "HKD"),
+    ("NT$", "TWD"),
+    ("NZ$", "NZD"),
+    ("MX$", "MXN"),
+    ("CN¥", "CNY"),
+    ("$", "USD"),
+    ("€", "EUR"),
+    ("£", "GBP"),
+    ("¥", "JPY"),
+    ("₩", "KRW"),
+    ("₹", "INR"),
+    ("₫", "VND"),
+    ("฿", "THB"),
+    ("₱", "PHP"),
+)
+# Currencies without a minor unit (ISO 4217 exponent 0)
+_ZERO_DECIMAL = frozenset({"JPY", "KRW", "VND", "CLP", "ISK", "PYG", "UGX", "XAF", "XOF"})
+
+_AMOUNT = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_ISO_CODE = re.compile(r"\b([A-Z]{3})\b")
+_DURATION_PART = re.compile(r"(\d+)\s*(day|hr|min)")
+_CLOCK = re.compile(
+    r"(\d{1,2}):(\d{2})\s*([AP]M)(?:\s+on\s+\w{3},\s+(\w{3})\s+(\d{1,2}))?", re.IGNORECASE
+)
+_MONTHS = {
+    name: i
+    for i, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+
+
+def minor_exponent(currency: str) -> int:
+    """Number of minor-unit digits for an ISO 4217 code."""
+    return 0 if currency in _ZERO_DECIMAL else 2
+
+
+def to_minor(amount: float, currency: str) -> int:
+    return round(amount * 10 ** minor_exponent(currency))
+
+
+def currency_symbol(currency: str) -> str:
+    """The prefix a price in ``currency`` is displayed with, or ``""``."""
+    if currency in CURRENCY_SYMBOLS:
+        return CURRENCY_SYMBOLS[currency]
+    return next((symbol for symbol, iso in _SYMBOL_CURRENCIES if iso == currency), "")
+
+
+def parse_price(text: str, currency: str = "") -> Tuple[Optional[int], Optional[str]]:
+    """Parse a displayed price such as ``"$1,234"`` or ``"₩268000"``.
+
+    Returns ``(minor_units, iso_currency)``. ``currency`` (the requested
+    ``curr``) wins over the symbol, which is ambiguous for ``$`` and ``¥``.
+    The currency is ``None`` when it cannot be determined; the amount is then
+    assumed to have two minor digits.
+    """
+    amount = _AMOUNT.search(text)
+    if amount is None:
+        return None, currency or None
+
+    code = currency
+    if not code:
+        prefix = text[: amount.start()].strip()
+        suffix = text[amount.end() :].strip()
+        iso = _ISO_CODE.search(prefix) or _ISO_CODE.search(suffix)
+        if iso:
+            code = iso.group(1)
+        else:
+            marker = prefix or suffix
+            code = next((iso for symbol, iso in _SYMBOL_CURRENCIES if marker.endswith(symbol)), "")
+
+    value = float(amount.group().replace(",", ""))
+    if not code:
+        return round(value * 100), None
+    return to_minor(value, code), code
+
+
+def parse_duration(text: str) -> Optional[int]:
+    """Minutes in a duration such as ``"2 hr 15 min"``, or ``None``."""
+    minutes = None
+    for value, unit in _DURATION_PART.findall(text):
+        minutes = (minutes or 0) + int(value) * {"day": 1440, "hr": 60, "min": 1}[unit]
+    return minutes
+
+
+def _nearest_year(month: int, day: int, near: datetime.date) -> Optional[datetime.date]:
+    candidates = []
+    for year in (near.year - 1, near.year, near.year + 1):
+        try:
+            candidates.append(datetime.date(year, month, day))
+        except ValueError:  # Feb 29
+            continue
+    return min(candidates, key=lambda d: abs(d - near), default=None)
+
+
+def parse_clock(text: str, near: datetime.date) -> Optional[datetime.datetime]:
+    """Parse ``"10:05 AM on Mon, Jul 21"`` into a datetime.
+
+    The page omits the year, so the one putting the date closest to ``near``
+    (the query date) is used. Without a date part, ``near`` itself is used.
+    """
+    match = _CLOCK.search(text)
+    if match is None:
+        return None
+
+    hour, minute, meridiem, month, day = match.groups()
+    hour = int(hour) % 12 + (12 if meridiem.upper() == "PM" else 0)
+    date: Optional[datetime.date] = near
+    if month:
+        month_number = _MONTHS.get(month[:3].lower())
+        if month_number is None:
+            return None
+        date = _nearest_year(month_number, int(day), near)
+        if date is None:
+            return None
+    return datetime.datetime(date.year, date.month, date.day, hour, int(minute))
@@ -0,0 +1,101 @@
+"""Bounded cache of parsed results, keyed by a hash of the page body."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from .schema import Result
+
+
+def page_key(html: str, *options: Hashable) -> Tuple[Hashable, ...]:
+    """Cache key for ``html`` parsed with ``options``.
+
+    Hashing the body costs a fraction of building its tree; ``options`` are
+    whatever else changes the parse (parser, currency, query date, ...).
+    """
+    return (hashlib.sha1(html.encode("utf-8")).digest(), *options)
+
+
+def _copy(result: Result) -> Result:
+    # Callers may set ``attempts`` or reorder ``flights``; the flights
+    # themselves are shared between copies
+    return Result(current_price=result.current_price, flights=list(result.flights))
+
+
+class ParseCache:
+    """A thread-safe LRU of parsed ``Result`` objects.
+
+    Identical pages show up when ``fallback`` mode retries a query and when
+    pages are replayed from cassettes. Each lookup returns a fresh ``Result``
+    with ``attempts=1`` around the cached flights.
+
+    Args:
+        max_size (int): Maximum results kept; ``0`` disables the cache.
+    """
+
+    def __init__(self, *, max_size: int = 256):
+        self.max_size = max_size
+        self._results: "OrderedDict[Hashable, Result]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evicted = 0
+
+    def get(self, key: Hashable) -> Optional[Result]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._results.move_to_end(key)
+            self._hits += 1
+        return _copy(result)
+
+    def put(self, key: Hashable, result: Result) -> None:
+        if self.max_size <= 0:
+            return
+        result = _copy(result)
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+                self._evicted += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._evicted += len(self._results)
+            self._results.clear()
+
+    def stats(self) -> dict:
+        """Counters for cache hits, misses and evictions."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evicted": self._evicted,
+                "size": len(self._results),
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = ParseCache()
+
+
+def get_parse_cache() -> ParseCache:
+    """Get the process-wide parse cache used by ``get_flights_from_filter``."""
+    return _cache
+
+
+def configure_parse_cache(*, max_size: int = 256) -> ParseCache:
+    """Replace the process-wide parse cache with an empty one.
+
+    Args:
+        max_size (int): Maximum results kept; ``0`` disables the cache.
+    """
+    global _cache
+    _cache.clear()
+    _cache = ParseCache(max_size=max_size)
+    return _cache
@@ -0,0 +1,239 @@
+"""Parse result pages in worker processes.
+
+Parsing is CPU-bound, so with many queries in flight a single process is
+capped at one core. A ``ParsePool`` ships page bodies to warm worker
+processes and gets back compact records (plain tuples) that are rebuilt into
+``Result`` objects. Fetching continues in the caller while workers parse.
+
+Off by default; enable it with :func:`configure_parse_pool`.
+"""
+
+import asyncio
+import concurrent.futures
+import datetime
+import multiprocessing
+import sys
+import threading
+from dataclasses import fields
+from typing import Any, List, Optional, Tuple
+
+from .metrics import ParseMetrics, ParseReport, get_parse_metrics, set_parse_metrics
+from .schema import Flight, Result, Segment
+
+_FLIGHT_FIELDS = tuple(f.name for f in fields(Flight))
+_SEGMENT_FIELDS = tuple(f.name for f in fields(Segment))
+_SEGMENTS = _FLIGHT_FIELDS.index("segments")
+# Strings the in-process parsers intern; unpickled copies are fresh objects,
+# so they are interned again to keep sharing them across results
+_FLIGHT_INTERNED = tuple(
+    _FLIGHT_FIELDS.index(name)
+    for name in ("name", "departure", "arrival", "arrival_time_ahead", "duration", "delay")
+)
+_SEGMENT_INTERNED = tuple(
+    _SEGMENT_FIELDS.index(name)
+    for name in (
+        "from_airport", "from_airport_name", "to_airport", "to_airport_name", "airline", "aircraft"
+    )
+)
+
+
+def _intern(values: Tuple[Any, ...], indices: Tuple[int, ...]) -> List[Any]:
+    values = list(values)
+    for i in indices:
+        if values[i]:
+            values[i] = sys.intern(values[i])
+    return values
+
+
+def _pack(result: Result) -> Tuple[Any, ...]:
+    flights = []
+    for flight in result.flights:
+        record = [getattr(flight, name) for name in _FLIGHT_FIELDS]
+        if flight.segments is not None:
+            record[_SEGMENTS] = [
+                tuple(getattr(segment, name) for name in _SEGMENT_FIELDS)
+                for segment in flight.segments
+            ]
+        flights.append(tuple(record))
+    return (result.current_price, flights)
+
+
+def _unpack(record: Tuple[Any, ...]) -> Result:
+    current_price, packed = record
+    flights = []
+    for values in packed:
+        flight = Flight(*_intern(values, _FLIGHT_INTERNED))
+        if flight.segments is not None:
+            flight.segments = [
+                Segment(*_intern(segment, _SEGMENT_INTERNED)) for segment in flight.segments
+            ]
+        flights.append(flight)
+    return Result(current_price=sys.intern(current_price), flights=flights)
+
+
+class _Forward(ParseMetrics):
+    """Holds a worker's parse reports until they are sent back with the page."""
+
+    def __init__(self):
+        super().__init__()
+        self.reports: List[ParseReport] = []
+
+    def record(self, report: ParseReport) -> None:
+        self.reports.append(report)
+
+
+def _warm_up() -> None:
+    # Import the parser (and selectolax) once per worker, not per page
+    from . import core  # noqa: F401
+
+    set_parse_metrics(_Forward())
+
+
+def _parse_page(
+    html: str, parser: str, currency: str, query_date: Optional[datetime.date]
+) -> Tuple[Any, ...]:
+    from .core import parse_response
+    from .transport import _cassette_response
+
+    forward = get_parse_metrics()
+    try:
+        record: Any = _pack(
+            parse_response(
+                _cassette_response(200, html),
+                parser=parser,  # type: ignore
+                currency=currency,
+                query_date=query_date,
+            )
+        )
+        error = None
+    except RuntimeError as e:
+        record, error = None, str(e)
+    reports: List[ParseReport] = []
+    if isinstance(forward, _Forward):
+        reports, forward.reports = forward.reports, []
+    return record, error, reports
+
+
+def _finish(outcome: Tuple[Any, ...]) -> Result:
+    record, error, reports = outcome
+    metrics = get_parse_metrics()
+    for report in reports:
+        metrics.record(report)
+    if error is not None:
+        raise RuntimeError(error)
+    return _unpack(record)
+
+
+def _context() -> Any:
+    # Forking a process that has threads running (the fetch executor, the
+    # event loop's resolver) can leave locks held in the child, so workers
+    # start from a fresh forkserver process, or a spawned one where that is
+    # unavailable (Windows)
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ParsePool:
+    """A pool of worker processes running ``parse_response``.
+
+    Workers are not forked from the caller, so a script that configures a
+    pool needs an ``if __name__ == "__main__":`` guard.
+
+    Args:
+        workers (int): Worker processes to start.
+    """
+
+    def __init__(self, *, workers: int = 2):
+        self.workers = workers
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=_context(), initializer=_warm_up
+        )
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._failed = 0
+
+    def _submit(
+        self,
+        html: str,
+        parser: str,
+        currency: str,
+        query_date: Optional[datetime.date],
+    ) -> "concurrent.futures.Future[Tuple[Any, ...]]":
+        with self._lock:
+            self._submitted += 1
+        future = self._executor.submit(_parse_page, html, parser, currency, query_date)
+        future.add_done_callback(self._record)
+        return future
+
+    def _record(self, future: "concurrent.futures.Future[Any]") -> None:
+        if (
+            future.cancelled()
+            or future.exception() is not None
+            or future.result()[1] is not None
+        ):
+            with self._lock:
+                self._failed += 1
+
+    def parse(
+        self,
+        html: str,
+        *,
+        parser: str = "dom",
+        currency: str = "",
+        query_date: Optional[datetime.date] = None,
+    ) -> Result:
+        """Parse ``html`` in a worker and wait for the result.
+
+        Raises what ``parse_response`` raises (e.g. ``RuntimeError`` for a page
+        without flights). The worker's parse reports are passed on to this
+        process's metrics sink.
+        """
+        return _finish(self._submit(html, parser, currency, query_date).result())
+
+    async def parse_async(
+        self,
+        html: str,
+        *,
+        parser: str = "dom",
+        currency: str = "",
+        query_date: Optional[datetime.date] = None,
+    ) -> Result:
+        """Async variant of :meth:`parse`."""
+        outcome = await asyncio.wrap_future(
+            self._submit(html, parser, currency, query_date)
+        )
+        return _finish(outcome)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """Counters for pages submitted to the workers and parse failures."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self._submitted,
+                "failed": self._failed,
+            }
+
+
+_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    """Get the process-wide parse pool, or ``None`` if parsing is in-process."""
+    return _pool
+
+
+def configure_parse_pool(*, workers: int = 2) -> Optional[ParsePool]:
+    """Replace the process-wide parse pool.
+
+    Args:
+        workers (int): Worker processes to start; ``0`` parses in-process.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = ParsePool(workers=workers) if workers > 0 else None
+    return _pool
@@ -0,0 +1,105 @@
+"""Process-wide pool of reusable HTTP clients."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from .primp import Client
+
+
+class ClientPool:
+    """A thread-safe pool of ``primp`` clients, keyed by impersonation profile.
+
+    Reusing a client keeps its connections alive, so consecutive queries skip
+    the TCP + TLS handshake.
+
+    Args:
+        max_size (int): Maximum idle clients kept per impersonation profile.
+        idle_timeout (float): Seconds after which an idle client is evicted.
+    """
+
+    def __init__(self, *, max_size: int = 8, idle_timeout: float = 90.0):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[str, List[Tuple[Client, float]]] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+        self._evicted = 0
+
+    def acquire(self, impersonate: str) -> Client:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.setdefault(impersonate, [])
+            while idle:
+                client, released_at = idle.pop()
+                if now - released_at <= self.idle_timeout:
+                    self._reused += 1
+                    return client
+                self._evicted += 1
+            self._created += 1
+
+        return Client(impersonate=impersonate, verify=False)
+
+    def release(self, impersonate: str, client: Client) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(impersonate, [])
+            if len(idle) < self.max_size:
+                idle.append((client, time.monotonic()))
+            else:
+                self._evicted += 1
+
+    def discard(self, impersonate: str, client: Client) -> None:
+        """Drop a client instead of returning it (e.g. after a network error)."""
+        with self._lock:
+            self._evicted += 1
+
+    @contextmanager
+    def client(self, impersonate: str) -> Iterator[Client]:
+        """Borrow a client for the duration of the ``with`` block."""
+        client = self.acquire(impersonate)
+        try:
+            yield client
+        except BaseException:
+            self.discard(impersonate, client)
+            raise
+        self.release(impersonate, client)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._evicted += sum(len(idle) for idle in self._idle.values())
+            self._idle.clear()
+
+    def stats(self) -> dict:
+        """Counters for client creation and reuse."""
+        with self._lock:
+            borrowed = self._created + self._reused
+            return {
+                "created": self._created,
+                "reused": self._reused,
+                "evicted": self._evicted,
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "reuse_rate": self._reused / borrowed if borrowed else 0.0,
+            }
+
+
+_pool = ClientPool()
+
+
+def get_client_pool() -> ClientPool:
+    """Get the process-wide client pool."""
+    return _pool
+
+
+def configure_client_pool(*, max_size: int = 8, idle_timeout: float = 90.0) -> ClientPool:
+    """Replace the process-wide client pool with a freshly configured one.
+
+    Args:
+        max_size (int): Maximum idle clients kept per impersonation profile.
+        idle_timeout (float): Seconds after which an idle client is evicted.
+    """
+    global _pool
+    _pool.clear()
+    _pool = ClientPool(max_size=max_size, idle_timeout=idle_timeout)
+    return _pool
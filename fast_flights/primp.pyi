@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 class Client:
     """Initializes an HTTP client that can impersonate web browsers.
@@ -115,3 +115,6 @@ class Response:
     text_plain: str
     text_rich: str
     url: str
+
+    def stream(self) -> Iterator[bytes]:
+        """Iterates over the response body in chunks as they arrive."""
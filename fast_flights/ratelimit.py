@@ -0,0 +1,142 @@
+"""Token-bucket rate limiting shared by every fetch path."""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .deadline import DeadlineExceeded
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    Callers reserve a token up front and are told how long to wait for it, so
+    the same bucket can pace both threads (``acquire``) and coroutines
+    (``acquire_async``).
+
+    Args:
+        rate (float): Tokens added per second. ``0`` disables limiting.
+        burst (int): Maximum number of tokens the bucket can hold.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._waited = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """Take one token and return how many seconds to wait before using it.
+
+        Raises ``DeadlineExceeded`` without taking a token if the wait would
+        be longer than ``max_wait`` seconds.
+        """
+        with self._lock:
+            if self.rate <= 0:
+                self._acquired += 1
+                return 0.0
+
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            delay = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            if max_wait is not None and delay > max_wait:
+                raise DeadlineExceeded("Deadline exceeded waiting for the rate limit")
+            self._acquired += 1
+            self._tokens -= 1
+            if delay > 0:
+                self._waited += 1
+                self._wait_total += delay
+                self._wait_max = max(self._wait_max, delay)
+            return delay
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """Wait for a token; ``timeout`` caps the wait (see :meth:`reserve`)."""
+        delay = self.reserve(timeout)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> float:
+        delay = self.reserve(timeout)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "wait_seconds_total": self._wait_total,
+                "wait_seconds_max": self._wait_max,
+                "wait_seconds_avg": (
+                    self._wait_total / self._acquired if self._acquired else 0.0
+                ),
+            }
+
+
+class RateLimiter:
+    """Token buckets keyed by ``(host, fetch mode)``.
+
+    Args:
+        default_rate (float): Requests per second for unconfigured keys.
+        default_burst (int): Burst size for unconfigured keys.
+    """
+
+    def __init__(self, *, default_rate: float = 2.0, default_burst: int = 4):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self, host: str, mode: str, *, rate: float, burst: Optional[int] = None
+    ) -> TokenBucket:
+        """Set the rate for one ``(host, mode)`` pair, replacing its bucket."""
+        bucket = TokenBucket(rate, self.default_burst if burst is None else burst)
+        with self._lock:
+            self._buckets[(host, mode)] = bucket
+        return bucket
+
+    def bucket(self, host: str, mode: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get((host, mode))
+            if bucket is None:
+                bucket = self._buckets[(host, mode)] = TokenBucket(
+                    self.default_rate, self.default_burst
+                )
+            return bucket
+
+    def acquire(self, host: str, mode: str, timeout: Optional[float] = None) -> float:
+        return self.bucket(host, mode).acquire(timeout)
+
+    async def acquire_async(
+        self, host: str, mode: str, timeout: Optional[float] = None
+    ) -> float:
+        return await self.bucket(host, mode).acquire_async(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {f"{host}/{mode}": b.stats() for (host, mode), b in buckets.items()}
+
+
+_limiter = RateLimiter()
+_limiter.configure("try.playwright.tech", "fallback", rate=0.5, burst=2)
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter."""
+    return _limiter
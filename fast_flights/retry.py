@@ -0,0 +1,109 @@
+"""Retry policy and failure classification for flight queries."""
+
+import random
+from dataclasses import dataclass
+from typing import FrozenSet, Literal, Optional
+
+from .deadline import DeadlineExceeded
+
+FailureKind = Literal[
+    "throttled",
+    "server_error",
+    "client_error",
+    "parse_failure",
+    "deadline",
+    "network",
+    "unknown",
+]
+
+# primp raises plain RuntimeErrors for transport failures; these are the
+# messages it uses (connect, TLS, timeout and body read errors)
+_REQUEST_ERRORS = (
+    "error sending request",
+    "error decoding response body",
+    "request or response body error",
+)
+
+
+class StatusError(AssertionError):
+    """Raised when a fetch returns a non-200 status code.
+
+    Subclasses ``AssertionError`` so existing ``except AssertionError``
+    handlers keep working.
+    """
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code} Result: {message}")
+        self.status_code = status_code
+
+
+def classify(exc: BaseException) -> FailureKind:
+    """Classify a failed query attempt.
+
+    Args:
+        exc (BaseException): The exception raised by fetch or parse.
+    """
+    if isinstance(exc, StatusError):
+        if exc.status_code == 429:
+            return "throttled"
+        if exc.status_code >= 500:
+            return "server_error"
+        return "client_error"
+
+    if isinstance(exc, DeadlineExceeded):
+        return "deadline"
+
+    if isinstance(exc, (OSError, TimeoutError)):
+        return "network"
+
+    if isinstance(exc, RuntimeError):
+        if str(exc).startswith(_REQUEST_ERRORS):
+            return "network"
+        # parse_response raises RuntimeError when no flights could be found
+        return "parse_failure"
+
+    # Playwright and asyncio (before 3.11) timeouts are not builtin TimeoutErrors
+    if type(exc).__name__ == "TimeoutError":
+        return "network"
+
+    # Anything else is most likely a bug; retrying will not help
+    return "unknown"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a total deadline.
+
+    Args:
+        max_attempts (int): Maximum attempts per query, including the first.
+        base_delay (float): Backoff before the second attempt, in seconds.
+        max_delay (float): Upper bound for a single backoff, in seconds.
+        deadline (float, optional): Total seconds allowed for all attempts.
+        retry_on (frozenset[str]): Failure kinds that are retried.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    deadline: Optional[float] = 30.0
+    retry_on: FrozenSet[str] = frozenset({"throttled", "server_error", "network"})
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to sleep after the given (1-based) failed attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def next_delay(
+        self, exc: BaseException, attempt: int, elapsed: float
+    ) -> Optional[float]:
+        """Return the backoff before the next attempt, or ``None`` to give up."""
+        if attempt >= self.max_attempts or classify(exc) not in self.retry_on:
+            return None
+
+        delay = self.backoff(attempt)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+import datetime
 from dataclasses import dataclass
 from typing import List, Literal, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Result:
     current_price: Literal["low", "typical", "high"]
     flights: List[Flight]
+    attempts: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Flight:
     is_best: bool
     name: str
@@ -18,6 +20,28 @@ class Flight:
     arrival: str
     arrival_time_ahead: str
     duration: str
-    stops: int
+    stops: Optional[int]
     delay: Optional[str]
     price: str
+    # Normalized from the strings above; None when they could not be parsed
+    price_minor: Optional[int] = None
+    currency: Optional[str] = None
+    duration_minutes: Optional[int] = None
+    departure_at: Optional[datetime.datetime] = None
+    arrival_at: Optional[datetime.datetime] = None
+    # Only filled in by the embedded-data parser
+    segments: Optional[List[Segment]] = None
+
+
+@dataclass(slots=True)
+class Segment:
+    from_airport: str
+    from_airport_name: str
+    to_airport: str
+    to_airport_name: str
+    departure: datetime.datetime
+    arrival: datetime.datetime
+    duration: int
+    airline: str
+    flight_number: str
+    aircraft: Optional[str]
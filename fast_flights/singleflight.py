@@ -0,0 +1,143 @@
+"""In-flight deduplication of identical queries."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from .deadline import DeadlineExceeded
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None  # type: ignore
+
+
+class SingleFlight:
+    """Collapses concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the work; callers arriving while it is in
+    flight wait for and share its result (or exception). Threads and
+    coroutines are deduplicated separately. A caller that passes ``timeout``
+    stops waiting for a shared call after that many seconds.
+
+    The key does not include the callers' time budgets, so a shared call can
+    run out of time while a waiting caller still has some left. Such a caller
+    does not inherit the ``DeadlineExceeded``; it runs ``fn`` again itself.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], "asyncio.Task[Any]"] = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._shared = 0
+
+    def do(
+        self, key: Hashable, fn: Callable[[], T], *, timeout: Optional[float] = None
+    ) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            started = time.monotonic()
+            if not call.done.wait(timeout):
+                raise DeadlineExceeded("Deadline exceeded")
+            if isinstance(call.error, DeadlineExceeded):
+                left = _left(timeout, started)
+                if left is None or left > 0:
+                    return self.do(key, fn, timeout=left)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        timeout: Optional[float] = None,
+    ) -> T:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        started = time.monotonic()
+
+        with self._lock:
+            task = self._tasks.get(loop_key)
+            leader = task is None
+            if leader:
+                task = self._tasks[loop_key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda t: self._forget(loop_key, t))
+                self._executed += 1
+            else:
+                self._shared += 1
+
+        try:
+            # Shield so that one cancelled caller does not cancel the shared work
+            if timeout is None:
+                return await asyncio.shield(task)
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), timeout)
+            except DeadlineExceeded:
+                raise
+            except asyncio.TimeoutError as e:
+                raise DeadlineExceeded("Deadline exceeded") from e
+        except DeadlineExceeded:
+            # Only retry when the shared call, not this caller, ran out of time
+            if leader or not task.done() or task.cancelled():
+                raise
+            left = _left(timeout, started)
+            if left is not None and left <= 0:
+                raise
+            return await self.do_async(key, fn, timeout=left)
+
+    def _forget(self, loop_key: Tuple[int, Hashable], task: "asyncio.Task[Any]") -> None:
+        with self._lock:
+            self._tasks.pop(loop_key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executed": self._executed,
+                "shared": self._shared,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
+
+
+def _left(timeout: Optional[float], started: float) -> Optional[float]:
+    if timeout is None:
+        return None
+    return timeout - (time.monotonic() - started)
+
+
+_inflight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group used by ``get_flights_from_filter``."""
+    return _inflight
@@ -0,0 +1,479 @@
+"""A local stand-in for the Google Flights results page, for load testing.
+
+The server decodes the ``tfs`` query parameter, synthesizes a results page
+that matches the selectors used by ``parse_response`` and can inject latency,
+429 responses and malformed pages::
+
+    python -m fast_flights.standin --port 8765 --latency 0.2 --throttle-rate 0.05
+
+Point ``fetch`` at it with ``FAST_FLIGHTS_BASE_URL=http://127.0.0.1:8765``
+(or ``set_transport(HttpTransport(server.url))``) and raise the client-side
+rate limit, which is keyed by host and defaults to 2 requests/s: set
+``FAST_FLIGHTS_RATE_LIMIT=1000`` for the MCP server, or call
+``get_rate_limiter().configure("127.0.0.1", "common", rate=1000)``.
+
+It also stands in for the remote Playwright run endpoint used by the
+fallback modes: set ``FAST_FLIGHTS_RUN_ENDPOINT`` to
+``http://127.0.0.1:8765/service/control/run``.
+"""
+
+import argparse
+import ast
+import base64
+import datetime
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from . import flights_pb2 as PB
+from .normalize import CURRENCY_SYMBOLS
+
+AIRLINES = (
+    "Korean Air",
+    "Asiana",
+    "Japan Airlines",
+    "ANA",
+    "Delta",
+    "United",
+    "American",
+    "Air Canada",
+    "Lufthansa",
+    "Air France",
+    "Emirates",
+    "Singapore Airlines",
+    "Jeju Air",
+    "Peach",
+)
+AIRLINE_CODES = (
+    "KE",
+    "OZ",
+    "JL",
+    "NH",
+    "DL",
+    "UA",
+    "AA",
+    "AC",
+    "LH",
+    "AF",
+    "EK",
+    "SQ",
+    "7C",
+    "MM",
+)
+HUBS = ("HND", "PVG", "TPE", "HKG", "SIN", "DXB", "FRA", "SEA", "LAX")
+SEAT_MULTIPLIERS = {0: 1.0, 1: 1.0, 2: 1.6, 3: 3.5, 4: 6.0}
+
+RUN_PATH = "/service/control/run"
+# How the fallback scripts name the pages they load
+_RUN_URL = re.compile(r'page\.goto\("([^"]+)"\)')
+_RUN_URLS = re.compile(r"^URLS = (.+)$", re.MULTILINE)
+_MAIN_OPEN = '<div role="main">'
+
+_ITEM = (
+    '<li class="pIav2d"><div class="JMc5Xc">'
+    '<div class="sSHqwe tPgKwe ogfYpf"><span>{name}</span></div>'
+    '<span class="mv1WYe"><div>{departure}</div><div>{arrival}</div></span>'
+    "{ahead}"
+    '<div class="Ak5kof"><div>{duration}</div></div>'
+    '<div class="BbR8Ec"><div class="EfT7Ae"><span class="ogfYpf">{stops}</span></div></div>'
+    "{delay}"
+    '<div class="YMlIz FpEdX"><span>{price}</span></div>'
+    "</div></li>"
+)
+
+
+def decode_tfs(tfs: str) -> "PB.Info":  # type: ignore
+    """Decode a ``tfs`` query value into a ``flights_pb2.Info`` message."""
+    info = PB.Info()
+    info.ParseFromString(base64.b64decode(tfs))
+    return info
+
+
+def _clock(moment: datetime.datetime) -> str:
+    return f"{moment.strftime('%I:%M %p').lstrip('0')} on {moment.strftime('%a, %b')} {moment.day}"
+
+
+def _format_duration(minutes: int) -> str:
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} hr {minutes} min" if minutes else f"{hours} hr"
+
+
+_CHROME = (
+    '<div class="gb_Ld"><div class="gb_Pd"><a class="gb_A" href="#" role="button">'
+    '<span class="gb_B">Travel</span></a></div></div>'
+)
+
+
+def _records(rng: random.Random, info, count: int) -> List[dict]:
+    leg = info.data[0]
+    max_stops = leg.max_stops if leg.HasField("max_stops") else 2
+    try:
+        day = datetime.datetime.strptime(leg.date, "%Y-%m-%d")
+    except ValueError:
+        day = datetime.datetime(2025, 1, 1)
+
+    multiplier = SEAT_MULTIPLIERS.get(info.seat, 1.0) * max(1, len(info.passengers))
+    records = []
+    for _ in range(count):
+        airline = rng.randrange(len(AIRLINES))
+        route = [leg.from_flight.airport]
+        route += rng.sample(HUBS, rng.randint(0, max(0, min(max_stops, 2))))
+        route.append(leg.to_flight.airport)
+
+        segments = []
+        departure = day + datetime.timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+        moment = departure
+        for origin, destination in zip(route, route[1:]):
+            if segments:
+                moment += datetime.timedelta(minutes=rng.randint(45, 240))
+            minutes = rng.randrange(60, 600, 5)
+            segments.append(
+                {
+                    "from": origin,
+                    "to": destination,
+                    "departure": moment,
+                    "arrival": moment + datetime.timedelta(minutes=minutes),
+                    "duration": minutes,
+                    "flight": (AIRLINE_CODES[airline], str(rng.randint(10, 9999))),
+                }
+            )
+            moment += datetime.timedelta(minutes=minutes)
+
+        stops = len(route) - 2
+        records.append(
+            {
+                "airline": AIRLINES[airline],
+                "segments": segments,
+                "duration": int((moment - departure).total_seconds() // 60),
+                "price": int(rng.randint(90, 900) * multiplier * (0.8 if stops else 1.0)),
+                "delayed": rng.random() < 0.05,
+            }
+        )
+    return records
+
+
+def _item(record: dict, symbol: str) -> str:
+    departure = record["segments"][0]["departure"]
+    arrival = record["segments"][-1]["arrival"]
+    ahead = (arrival.date() - departure.date()).days
+    stops = len(record["segments"]) - 1
+    return _ITEM.format(
+        name=record["airline"],
+        departure=_clock(departure),
+        arrival=_clock(arrival),
+        ahead=f'<span class="bOzv6">+{ahead}</span>' if ahead else "",
+        duration=_format_duration(record["duration"]),
+        stops="Nonstop" if stops == 0 else f"{stops} stop{'s' if stops > 1 else ''}",
+        delay='<div class="GsCCve">Often delayed by 30+ min</div>'
+        if record["delayed"]
+        else "",
+        price=f"{symbol}{record['price']:,}",
+    )
+
+
+def _entry(record: dict) -> list:
+    # Mirrors the layout fast_flights.embedded expects
+    segments = []
+    for segment in record["segments"]:
+        raw: list = [None] * 23
+        raw[3], raw[4] = segment["from"], f"{segment['from']} International Airport"
+        raw[5], raw[6] = f"{segment['to']} International Airport", segment["to"]
+        raw[8] = [segment["departure"].hour, segment["departure"].minute]
+        raw[10] = [segment["arrival"].hour, segment["arrival"].minute]
+        raw[11] = segment["duration"]
+        raw[17] = "Boeing 787"
+        raw[20] = [segment["departure"].year, segment["departure"].month, segment["departure"].day]
+        raw[21] = [segment["arrival"].year, segment["arrival"].month, segment["arrival"].day]
+        raw[22] = [segment["flight"][0], segment["flight"][1], None, record["airline"]]
+        segments.append(raw)
+
+    itinerary: list = [None] * 10
+    itinerary[0] = record["segments"][0]["flight"][0]
+    itinerary[1] = [record["airline"]]
+    itinerary[2] = segments
+    itinerary[9] = record["duration"]
+    return [itinerary, [[None, record["price"]]]]
+
+
+def render_page(info, currency: str = "", *, seed: int = 0, padding: int = 256 * 1024) -> str:
+    """Synthesize a results page for ``info``.
+
+    The same query and seed always render the same page.
+
+    Args:
+        info (flights_pb2.Info): The decoded query.
+        currency (str): Currency code from the ``curr`` parameter.
+        seed (int): Seed mixed into the per-query generator.
+        padding (int): Approximate bytes of page chrome outside the results
+            (a quarter as navigation markup, the rest as script), like the
+            real page carries.
+    """
+    digest = hashlib.sha1(info.SerializeToString(deterministic=True) + currency.encode())
+    rng = random.Random(int.from_bytes(digest.digest()[:8], "big") ^ seed)
+
+    best = _records(rng, info, rng.randint(2, 4))
+    other = _records(rng, info, rng.randint(6, 20))
+    symbol = CURRENCY_SYMBOLS.get(currency or "USD", "$")
+    payload = [
+        None,
+        None,
+        [[_entry(record) for record in best]],
+        [[_entry(record) for record in other]],
+    ]
+    return (
+        "<!DOCTYPE html><html><head><title>Google Flights</title></head><body>"
+        "<header>{chrome}</header>"
+        '<div role="main"><div class="eQ35Ce"></div>'
+        '<div class="frOi8"><span class="gOatQ">{price}</span></div>'
+        '<div jsname="IWWDBc"><ul class="Rk10dc">{best}</ul></div>'
+        '<div jsname="YdtKid"><ul class="Rk10dc">{other}'
+        # parse_response drops the last item of later lists ("View more flights")
+        '<li class="ZVk93d"><span>View more flights</span></li></ul></div>'
+        "</div><script>{padding}</script>"
+        "<script class=\"ds:1\">AF_initDataCallback({{key: 'ds:1', hash: '1', "
+        "data:{payload}, sideChannel: {{}}}});</script></body></html>"
+    ).format(
+        price=rng.choice(("low", "typical", "high")),
+        best="".join(_item(record, symbol) for record in best),
+        other="".join(_item(record, symbol) for record in other),
+        chrome=_CHROME * (padding // 4 // len(_CHROME)),
+        padding="/*" + "x" * max(0, padding * 3 // 4 - 4) + "*/",
+        payload=json.dumps(payload, separators=(",", ":")),
+    )
+
+
+class StandinServer:
+    """A threaded HTTP server answering ``/travel/flights`` like Google does.
+
+    Args:
+        host (str): Interface to bind to.
+        port (int): Port to bind to; ``0`` picks a free one.
+        latency (float): Seconds each response is delayed by.
+        jitter (float): Extra random delay of up to this many seconds.
+        throttle_rate (float): Fraction of requests answered with a 429.
+        malformed_rate (float): Fraction of requests answered with a page
+            that has no parsable results.
+        seed (int): Seed for page contents and fault injection.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {
+            "requests": 0,
+            "ok": 0,
+            "throttled": 0,
+            "malformed": 0,
+            "bad_request": 0,
+            "runs": 0,
+        }
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, suitable for ``FAST_FLIGHTS_BASE_URL``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts[outcome] += 1
+
+    def _draw(self) -> Tuple[float, float]:
+        with self._lock:
+            return self._rng.random(), self._rng.uniform(0, self.jitter)
+
+    def respond(self, path: str) -> Tuple[int, str]:
+        """Build the ``(status, body)`` for a request path."""
+        url = urlsplit(path)
+        if url.path.rstrip("/") != "/travel/flights":
+            self._count("bad_request")
+            return 404, "Not found"
+
+        query = parse_qs(url.query)
+        try:
+            info = decode_tfs(query["tfs"][0])
+            if not info.data:
+                raise ValueError("no flight data")
+        except Exception:
+            self._count("bad_request")
+            return 400, "Bad tfs"
+
+        draw, jitter = self._draw()
+        delay = self.latency + jitter
+        if delay:
+            time.sleep(delay)
+
+        if draw < self.throttle_rate:
+            self._count("throttled")
+            return 429, "Too Many Requests"
+
+        page = render_page(info, query.get("curr", [""])[0], seed=self.seed)
+        if draw < self.throttle_rate + self.malformed_rate:
+            self._count("malformed")
+            # Cut the page off before the first result list
+            return 200, page[: page.index('<div jsname="IWWDBc">')]
+
+        self._count("ok")
+        return 200, page
+
+    def _main_html(self, url: str) -> Optional[str]:
+        # What the fallback script reads: the innerHTML of [role="main"], or
+        # None where the page would not have rendered its results
+        query = parse_qs(urlsplit(url).query)
+        info = decode_tfs(query["tfs"][0])
+        page = render_page(info, query.get("curr", [""])[0], seed=self.seed)
+        draw, _ = self._draw()
+        if draw < self.malformed_rate:
+            self._count("malformed")
+            return None
+        self._count("ok")
+        start = page.index(_MAIN_OPEN) + len(_MAIN_OPEN)
+        return page[start : page.index("</div><script>", start)]
+
+    def respond_run(self, path: str, body: bytes) -> Tuple[int, str]:
+        """Answer a run endpoint ``POST`` like the remote Playwright service.
+
+        The posted script is compiled, not executed; the URLs it would load
+        are taken from its source.
+        """
+        if urlsplit(path).path.rstrip("/") != RUN_PATH:
+            self._count("bad_request")
+            return 404, "Not found"
+        try:
+            code = json.loads(body)["code"]
+            compile(code, "<run>", "exec")
+            batch = _RUN_URLS.search(code)
+            urls = ast.literal_eval(batch.group(1)) if batch else [_RUN_URL.search(code).group(1)]  # type: ignore
+        except Exception:
+            self._count("bad_request")
+            return 400, "Bad script"
+
+        with self._lock:
+            self._counts["runs"] += 1
+        draw, jitter = self._draw()
+        delay = self.latency + jitter
+        if delay:
+            time.sleep(delay)
+        if draw < self.throttle_rate:
+            self._count("throttled")
+            return 429, "Too Many Requests"
+
+        try:
+            bodies = [self._main_html(url) for url in urls]
+        except Exception:
+            self._count("bad_request")
+            return 400, "Bad tfs"
+        if batch:
+            output = json.dumps(bodies)
+        else:
+            output = bodies[0] or "TimeoutError: Locator.wait_for: Timeout 30000ms exceeded."
+        return 200, json.dumps({"output": output})
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._send(*server.respond(self.path), "text/html")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                status, body = server.respond_run(self.path, self.rfile.read(length))
+                self._send(status, body, "application/json")
+
+            def _send(self, status: int, body: str, content_type: str):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *_):
+                pass
+
+        return Handler
+
+    def start(self) -> "StandinServer":
+        """Serve on a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fast-flights-standin", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = StandinServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    print(f"Serving Google Flights stand-in on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
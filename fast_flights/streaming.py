@@ -0,0 +1,144 @@
+"""Incremental body reading that stops once the result lists are complete."""
+
+import re
+import threading
+from typing import Any, Iterable, Optional, Tuple
+
+# "Other departing flights" is the last results container on the page
+_LAST_CONTAINER = b'jsname="YdtKid"'
+# Must precede it on a results page, as trim.py assumes too
+_MAIN = b'role="main"'
+_FIRST_CONTAINER = b'jsname="IWWDBc"'
+_UL_TAG = re.compile(rb"<(/?)ul\b")
+
+
+class ResultsBoundary:
+    """Finds where the last results list closes in a growing HTML buffer.
+
+    If the first last-container marker does not look like the real container
+    (it is not on a ``<div>`` after the main region and the first container,
+    e.g. it sits in an inline script) or its list does not balance, the
+    boundary is abandoned and the body is read to the end, as with trimming.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._container_at: Optional[int] = None
+        self._pos = 0
+        self._depth = 0
+        self.end: Optional[int] = None
+        self.abandoned = False
+
+    def _is_container(self, at: int) -> bool:
+        tag = self.buffer.rfind(b"<", 0, at)
+        if tag == -1 or self.buffer.rfind(b">", 0, at) > tag:
+            return False
+        if not self.buffer.startswith(b"<div", tag):
+            return False
+        main = self.buffer.find(_MAIN, 0, at)
+        return main != -1 and self.buffer.find(_FIRST_CONTAINER, main, at) != -1
+
+    def feed(self, chunk: bytes) -> bool:
+        """Append ``chunk``; return ``True`` once the boundary has been found."""
+        self.buffer += chunk
+        if self.end is not None:
+            return True
+        if self.abandoned:
+            return False
+
+        if self._container_at is None:
+            start = max(0, self._pos - len(_LAST_CONTAINER))
+            found = self.buffer.find(_LAST_CONTAINER, start)
+            if found == -1:
+                self._pos = len(self.buffer)
+                return False
+            if not self._is_container(found):
+                self.abandoned = True
+                return False
+            self._container_at = self._pos = found + len(_LAST_CONTAINER)
+
+        # Leave room for a tag split across chunks
+        limit = len(self.buffer) - 4
+        for match in _UL_TAG.finditer(self.buffer, self._pos, max(self._pos, limit)):
+            self._pos = match.end()
+            if match.group(1):
+                if self._depth <= 0:
+                    # A list closing before any opened: not the real container
+                    self.abandoned = True
+                    return False
+                self._depth -= 1
+                if self._depth == 0:
+                    close = self.buffer.find(b">", match.end())
+                    if close == -1:
+                        # Rescan this tag once more of it has arrived
+                        self._pos = match.start()
+                        self._depth += 1
+                        return False
+                    self.end = close + 1
+                    return True
+            else:
+                self._depth += 1
+
+        return False
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.early_stops = 0
+        self.bytes_read = 0
+
+    def record(self, bytes_read: int, early_stop: bool) -> None:
+        with self._lock:
+            self.pages += 1
+            self.early_stops += early_stop
+            self.bytes_read += bytes_read
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "pages": self.pages,
+                "early_stops": self.early_stops,
+                "bytes_read": self.bytes_read,
+                "avg_bytes_per_page": self.bytes_read / self.pages if self.pages else 0.0,
+            }
+
+
+_stats = _Stats()
+
+
+def read_until_results(chunks: Iterable[bytes]) -> Tuple[str, int, bool]:
+    """Read ``chunks`` until the result lists are complete.
+
+    Returns ``(html, bytes_read, stopped_early)``. When the end of the last
+    results container is never seen, the whole body is returned.
+    """
+    boundary = ResultsBoundary()
+    for chunk in chunks:
+        if boundary.feed(chunk):
+            break
+
+    stopped_early = boundary.end is not None
+    body = bytes(boundary.buffer[: boundary.end] if stopped_early else boundary.buffer)
+    _stats.record(len(boundary.buffer), stopped_early)
+    return body.decode("utf-8", errors="replace"), len(boundary.buffer), stopped_early
+
+
+def streamed_response(res: Any) -> Any:
+    """Read a ``primp`` response incrementally into a response-like object."""
+    body, n_read, early = read_until_results(res.stream())
+
+    class StreamedResponse:
+        status_code = res.status_code
+        text = body
+        text_markdown = body
+        bytes_read = n_read
+        stopped_early = early
+
+    return StreamedResponse
+
+
+def stream_stats() -> dict:
+    """Counters for streamed reads: pages, early stops and bytes read."""
+    return _stats.as_dict()
@@ -0,0 +1,263 @@
+"""Pluggable transports for ``fetch``, including on-disk record/replay."""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+from urllib.parse import urlsplit
+
+from . import flights_pb2 as PB
+from .pool import get_client_pool
+from .streaming import streamed_response
+
+BASE_URL = "https://www.google.com"
+
+
+def flights_url(base_url: Optional[str] = None) -> str:
+    """The results page URL under ``base_url``.
+
+    Defaults to ``FAST_FLIGHTS_BASE_URL`` (e.g. a local stand-in server, see
+    :mod:`fast_flights.standin`), then Google.
+    """
+    base_url = base_url or os.environ.get("FAST_FLIGHTS_BASE_URL") or BASE_URL
+    return base_url.rstrip("/") + "/travel/flights"
+
+
+def url_host(url: str) -> str:
+    """The host of ``url``, as keyed by the rate limiter."""
+    return urlsplit(url).hostname or ""
+
+
+def _cassette_response(status: int, body: str, chunk_size: int = 16384) -> Any:
+    class CassetteResponse:
+        status_code = status
+        text = body
+        text_markdown = body
+
+        @staticmethod
+        def stream() -> Iterator[bytes]:
+            data = body.encode("utf-8")
+            for i in range(0, len(data), chunk_size):
+                yield data[i : i + chunk_size]
+
+    return CassetteResponse
+
+
+def canonical_tfs(tfs: str) -> str:
+    """Re-encode a ``tfs`` value so equivalent filters share one key.
+
+    Falls back to the raw value when it is not a valid ``Info`` message.
+    """
+    try:
+        info = PB.Info()
+        info.ParseFromString(base64.b64decode(tfs))
+        return base64.b64encode(info.SerializeToString(deterministic=True)).decode()
+    except Exception:
+        return tfs
+
+
+def cassette_key(params: dict) -> str:
+    """Key a request by canonical ``tfs``, currency and language."""
+    raw = "|".join(
+        (canonical_tfs(params.get("tfs", "")), params.get("curr", ""), params.get("hl", ""))
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class CassetteStore:
+    """A directory of recorded responses, one JSON file per request key.
+
+    Args:
+        directory (str | Path): Where cassettes are read from and written to.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def path(self, params: dict) -> Path:
+        return self.directory / f"{cassette_key(params)}.json"
+
+    def load(self, params: dict) -> Optional[dict]:
+        try:
+            with open(self.path(params), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, params: dict, status_code: int, text: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(params)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "status_code": status_code, "text": text}, f)
+        os.replace(tmp, path)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.json"))
+
+
+class HttpTransport:
+    """Fetches live pages with pooled ``primp`` clients.
+
+    Args:
+        base_url (str, optional): Scheme and host requests are sent to.
+            Defaults to :func:`flights_url`'s choice.
+    """
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.url = flights_url(base_url)
+        self.host = url_host(self.url)
+
+    def get(
+        self,
+        params: dict,
+        *,
+        impersonate: str = "chrome_126",
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Any:
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        with get_client_pool().client(impersonate) as client:
+            res = client.get(self.url, params=params, **kwargs)
+            if stream and res.status_code == 200:
+                res = streamed_response(res)
+        return res
+
+
+class RecordingTransport:
+    """Fetches through ``inner`` and stores every response in ``store``.
+
+    Args:
+        store (CassetteStore): Where responses are recorded.
+        inner (HttpTransport, optional): Transport that performs the request.
+    """
+
+    def __init__(self, store: CassetteStore, inner: Optional[HttpTransport] = None):
+        self.store = store
+        self.inner = inner or HttpTransport()
+        self.host = self.inner.host
+
+    def get(
+        self,
+        params: dict,
+        *,
+        impersonate: str = "chrome_126",
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Any:
+        # Always record the full body; streaming is replayed from it
+        res = self.inner.get(params, impersonate=impersonate, timeout=timeout)
+        self.store.save(params, res.status_code, res.text)
+        res = _cassette_response(res.status_code, res.text)
+        if stream and res.status_code == 200:
+            res = streamed_response(res)
+        return res
+
+
+class ReplayTransport:
+    """Serves recorded responses with synthetic latency.
+
+    Requests without a cassette get a 404 response, which is not retried.
+
+    Args:
+        store (CassetteStore): Where responses are read from.
+        latency (float): Seconds each response is delayed by.
+        jitter (float): Extra random delay of up to this many seconds.
+    """
+
+    # Rate limited under its own key; no live host is contacted
+    host = "replay"
+
+    def __init__(self, store: CassetteStore, *, latency: float = 0.0, jitter: float = 0.0):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(
+        self,
+        params: dict,
+        *,
+        impersonate: str = "chrome_126",
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> Any:
+        delay = self.latency + random.uniform(0, self.jitter)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Replay latency exceeds the request timeout")
+        if delay:
+            time.sleep(delay)
+
+        cassette = self.store.load(params)
+        with self._lock:
+            if cassette is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if cassette is None:
+            return _cassette_response(404, f"No cassette for {cassette_key(params)}")
+
+        res = _cassette_response(cassette["status_code"], cassette["text"])
+        if stream and res.status_code == 200:
+            res = streamed_response(res)
+        return res
+
+    def stats(self) -> dict:
+        with self._lock:
+            served = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / served if served else 0.0,
+            }
+
+
+Transport = Union[HttpTransport, RecordingTransport, ReplayTransport]
+
+
+def _transport_from_env() -> Transport:
+    # FAST_FLIGHTS_TRANSPORT=record|replay lets the MCP server run against
+    # cassettes without code changes
+    kind = os.environ.get("FAST_FLIGHTS_TRANSPORT", "http")
+    if kind == "http":
+        return HttpTransport()
+
+    store = CassetteStore(os.environ.get("FAST_FLIGHTS_CASSETTES", "cassettes"))
+    if kind == "record":
+        return RecordingTransport(store)
+    if kind == "replay":
+        return ReplayTransport(
+            store, latency=float(os.environ.get("FAST_FLIGHTS_REPLAY_LATENCY", "0"))
+        )
+    raise ValueError(f"Unknown FAST_FLIGHTS_TRANSPORT: {kind!r}")
+
+
+_transport: Transport = _transport_from_env()
+
+
+def get_transport() -> Transport:
+    """Get the transport used by ``fetch``.
+
+    Its ``host`` is the key ``fetch`` rate-limits under.
+    """
+    return _transport
+
+
+def set_transport(transport: Transport) -> Transport:
+    """Replace the transport used by ``fetch``; returns the previous one.
+
+    Args:
+        transport (HttpTransport | RecordingTransport | ReplayTransport): The
+            new transport.
+    """
+    global _transport
+    previous, _transport = _transport, transport
+    return previous
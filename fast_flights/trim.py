@@ -0,0 +1,97 @@
+"""Cut a results page down to its ``[role="main"]`` region before parsing."""
+
+import re
+import threading
+from typing import Optional
+
+_MAIN = 'role="main"'
+_FIRST_CONTAINER = 'jsname="IWWDBc"'
+_LAST_CONTAINER = 'jsname="YdtKid"'
+_UL_TAG = re.compile(r"<(/?)ul\b")
+# Markers whose every occurrence must survive trimming
+_MARKERS = (_FIRST_CONTAINER, _LAST_CONTAINER, "gOatQ")
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.trimmed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, size: int, trimmed_size: Optional[int]) -> None:
+        with self._lock:
+            self.pages += 1
+            self.bytes_in += size
+            if trimmed_size is None:
+                self.bytes_out += size
+            else:
+                self.trimmed += 1
+                self.bytes_out += trimmed_size
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "pages": self.pages,
+                "trimmed": self.trimmed,
+                "fallbacks": self.pages - self.trimmed,
+                "kept_ratio": self.bytes_out / self.bytes_in if self.bytes_in else 1.0,
+            }
+
+
+_stats = _Stats()
+
+
+def results_region(html: str) -> Optional[str]:
+    """Slice ``html`` from the ``[role="main"]`` element to the end of the
+    last results list, or return ``None``.
+
+    ``None`` is returned when either end cannot be found or a result marker
+    would be lost, so callers parse the whole page. The slice leaves elements
+    unclosed, which the HTML parser closes as usual.
+    """
+    marker = html.find(_MAIN)
+    if marker == -1:
+        return None
+    start = html.rfind("<", 0, marker)
+    if start == -1:
+        return None
+
+    last = html.rfind(_LAST_CONTAINER)
+    if last == -1:
+        last = html.rfind(_FIRST_CONTAINER)
+    if last < start:
+        return None
+
+    depth = 0
+    end = None
+    for match in _UL_TAG.finditer(html, last):
+        if match.group(1):
+            depth -= 1
+            if depth <= 0:
+                close = html.find(">", match.end())
+                end = None if close == -1 else close + 1
+                break
+        else:
+            depth += 1
+    if end is None:
+        return None
+
+    region = html[start:end]
+    for text in _MARKERS:
+        if region.count(text) != html.count(text):
+            return None
+    return region
+
+
+def trim_to_results(html: str) -> str:
+    """Return just the results region of ``html`` when it can be isolated safely."""
+    region = results_region(html)
+    _stats.record(len(html), None if region is None else len(region))
+    return html if region is None else region
+
+
+def trim_stats() -> dict:
+    """Counters for trimmed pages, full-parse fallbacks and bytes kept."""
+    return _stats.as_dict()
@@ -12,14 +12,16 @@ from fast_flights import FlightData, Passengers, get_flights
 # UTF-8 인코딩 설정
 sys.stdout.reconfigure(encoding='utf-8')
 
-def parse_price(price_str):
-    """가격 문자열에서 숫자 추출"""
-    if not price_str or not isinstance(price_str, str):
-        return float('inf')
-    try:
-        return int(price_str.replace('₩', '').replace(',', '').replace('원', ''))
-    except ValueError:
-        return float('inf')
+def flight_price(flight):
+    """가격 정렬 키 (최소 통화 단위, 가격이 없으면 맨 뒤로)"""
+    price = getattr(flight, 'price_minor', None)
+    return price if price is not None else float('inf')
+
+def price_numeric(flight):
+    """저장된 항공편 딕셔너리의 가격 (price_minor가 없는 이전 결과는 문자열에서 추출)"""
+    if flight.get('price_minor') is not None:
+        return flight['price_minor']
+    return int(str(flight['price']).replace('₩', '').replace(',', '').replace('원', ''))
 
 def filter_flights_by_airline(flights, airline_filter):
     """항공사 이름으로 항공편 필터링 (대소문자 구분 없이 부분 일치)"""
@@ -103,7 +105,7 @@ def search_flights(params):
                             
                             if filtered_flights:
                                 # 최저가 항공편 찾기
-                                cheapest_flight = min(filtered_flights, key=lambda f: parse_price(f.price))
+                                cheapest_flight = min(filtered_flights, key=flight_price)
                                 
                                 flight_dict = {
                                     'departure_date': depart_date.strftime('%Y-%m-%d'),
@@ -116,6 +118,9 @@ def search_flights(params):
                                         'duration': getattr(cheapest_flight, 'duration', None),
                                         'stops': getattr(cheapest_flight, 'stops', None),
                                         'price': getattr(cheapest_flight, 'price', None),
+                                        'price_minor': getattr(cheapest_flight, 'price_minor', None),
+                                        'currency': getattr(cheapest_flight, 'currency', None),
+                                        'duration_minutes': getattr(cheapest_flight, 'duration_minutes', None),
                                         'delay': getattr(cheapest_flight, 'delay', None),
                                         'is_best': getattr(cheapest_flight, 'is_best', None),
                                     }
@@ -156,10 +161,7 @@ def display_results(results_data, params):
         
         # 직항편(stops=0)이고 가격이 있는 항공편만 유지
         if flight['stops'] == 0 and flight['price'] and flight['price'] != "0" and flight['price'] != "":
-            # 가격에서 숫자만 추출
-            price_str = str(flight['price']).replace('₩', '').replace(',', '').replace('원', '')
             try:
-                price_numeric = int(price_str)
                 valid_flights.append({
                     'departure_date': option['departure_date'],
                     'return_date': option['return_date'],
@@ -168,7 +170,7 @@ def display_results(results_data, params):
                     'arrival_time': flight['arrival'],
                     'duration': flight['duration'],
                     'price': flight['price'],
-                    'price_numeric': price_numeric,
+                    'price_numeric': price_numeric(flight),
                     'stops': flight['stops']
                 })
             except ValueError:
@@ -61,10 +61,12 @@ def process_flight_data(origin='PUS', destination='NRT', pattern=None):
         
         # 직항편(stops=0)이고 가격이 있는 항공편만 유지
         if flight['stops'] == 0 and flight['price'] and flight['price'] != "0" and flight['price'] != "":
-            # 가격에서 숫자만 추출 (₩ 기호와 쉼표 제거)
-            price_str = str(flight['price']).replace('₩', '').replace(',', '').replace('원', '')
             try:
-                price_numeric = int(price_str)
+                # price_minor가 없는 이전 결과는 문자열에서 숫자만 추출 (₩ 기호와 쉼표 제거)
+                if flight.get('price_minor') is not None:
+                    price_numeric = flight['price_minor']
+                else:
+                    price_numeric = int(str(flight['price']).replace('₩', '').replace(',', '').replace('원', ''))
                 valid_flights.append({
                     'departure_date': option['departure_date'],
                     'return_date': option['return_date'],
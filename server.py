@@ -5,11 +5,20 @@ import json
 import datetime
 import sys
 import os
+import time
 from typing import Any, Optional, Dict
 
 # --- fast_flights should now be in the same directory ---
 try:
-    from fast_flights import FlightData, Passengers, get_flights
+    from fast_flights import (
+        DeadlineExceeded,
+        FlightData,
+        Passengers,
+        configure_parse_pool,
+        get_flights_async,
+        get_rate_limiter,
+        get_transport,
+    )
 except ImportError as e:
     print(f"Error importing fast_flights: {e}", file=sys.stderr)
     print(f"Ensure the 'fast_flights' directory is present alongside server.py.", file=sys.stderr)
@@ -24,6 +33,8 @@ mcp = FastMCP("google-flights-cheapest-finder")
 
 def flight_to_dict(flight):
     """Converts a flight object to a dictionary, handling potential missing attributes."""
+    departure_at = getattr(flight, 'departure_at', None)
+    arrival_at = getattr(flight, 'arrival_at', None)
     return {
         "is_best": getattr(flight, 'is_best', None),
         "name": getattr(flight, 'name', None),
@@ -34,16 +45,17 @@ def flight_to_dict(flight):
         "stops": getattr(flight, 'stops', None),
         "delay": getattr(flight, 'delay', None),
         "price": getattr(flight, 'price', None),
+        "price_minor": getattr(flight, 'price_minor', None),
+        "currency": getattr(flight, 'currency', None),
+        "duration_minutes": getattr(flight, 'duration_minutes', None),
+        "departure_at": departure_at.isoformat() if departure_at else None,
+        "arrival_at": arrival_at.isoformat() if arrival_at else None,
     }
 
-def parse_price(price_str):
-    """Extracts integer price from a string like '$268'."""
-    if not price_str or not isinstance(price_str, str):
-        return float('inf') # Return infinity if price is missing or invalid
-    try:
-        return int(price_str.replace('$', '').replace(',', ''))
-    except ValueError:
-        return float('inf') # Return infinity if conversion fails
+def flight_price(flight):
+    """Sort key for a flight's price (minor units); flights without a price sort last."""
+    price = getattr(flight, 'price_minor', None)
+    return price if price is not None else float('inf')
 
 def filter_flights_by_airline(flights, airline_filter):
     """Filters flights by airline name using case-insensitive partial matching."""
@@ -77,6 +89,17 @@ def get_date_range(year, month):
         yield current_date
         current_date += datetime.timedelta(days=1)
 
+async def run_bounded(items, worker, max_in_flight):
+    """Runs `worker(item)` for every item with at most `max_in_flight` running at once.
+    Results are returned in the same order as `items`, regardless of completion order."""
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def run_one(item):
+        async with semaphore:
+            return await worker(item)
+
+    return await asyncio.gather(*(run_one(item) for item in items))
+
 # --- MCP Tool Implementations ---
 
 @mcp.tool()
@@ -86,7 +109,8 @@ async def get_flights_on_date(
     date: str,
     adults: int = 1,
     seat_type: str = "economy",
-    return_cheapest_only: bool = False # Added parameter
+    return_cheapest_only: bool = False, # Added parameter
+    timeout_seconds: float = None
 ) -> str:
     """
     Fetches available one-way flights for a specific date between two airports.
@@ -99,6 +123,7 @@ async def get_flights_on_date(
         adults: Number of adult passengers (default: 1).
         seat_type: Fare class (e.g., "economy", "business", default: "economy").
         return_cheapest_only: If True, returns only the cheapest flight (default: False).
+        timeout_seconds: Time budget for the search in seconds (optional). The search is abandoned when it runs out.
 
     Example Args:
         {"origin": "SFO", "destination": "JFK", "date": "2025-07-20"}
@@ -114,17 +139,19 @@ async def get_flights_on_date(
         ]
         passengers_info = Passengers(adults=adults)
 
-        result = get_flights(
+        result = await get_flights_async(
             flight_data=flight_data,
             trip="one-way", # Explicitly one-way for this tool
             seat=seat_type,
             passengers=passengers_info,
+            hedge=True, # Race a second request if Google is slow to answer
+            timeout=timeout_seconds,
         )
 
         if result and result.flights:
             # Process flights based on the new parameter
             if return_cheapest_only:
-                cheapest_flight = min(result.flights, key=lambda f: parse_price(f.price))
+                cheapest_flight = min(result.flights, key=flight_price)
                 processed_flights = [flight_to_dict(cheapest_flight)]
                 result_key = "cheapest_flight" # Use a specific key for single result
             else:
@@ -153,6 +180,9 @@ async def get_flights_on_date(
          # Return structured error
          error_payload = {"error": {"message": f"Invalid date format: '{date}'. Please use YYYY-MM-DD.", "type": "ValueError"}}
          return json.dumps(error_payload)
+    except DeadlineExceeded:
+        error_payload = {"error": {"message": f"Deadline exceeded: no result within {timeout_seconds} seconds.", "type": "DeadlineExceeded"}}
+        return json.dumps(error_payload)
     except Exception as e:
         print(f"MCP Tool Error in get_flights_on_date: {e}", file=sys.stderr)
         # Return structured error
@@ -168,7 +198,8 @@ async def get_round_trip_flights(
     return_date: str,
     adults: int = 1,
     seat_type: str = "economy",
-    return_cheapest_only: bool = False # Added parameter
+    return_cheapest_only: bool = False, # Added parameter
+    timeout_seconds: float = None
 ) -> str:
     """
     Fetches available round-trip flights for specific departure and return dates.
@@ -182,6 +213,7 @@ async def get_round_trip_flights(
         adults: Number of adult passengers (default: 1).
         seat_type: Fare class (e.g., "economy", "business", default: "economy").
         return_cheapest_only: If True, returns only the cheapest flight (default: False).
+        timeout_seconds: Time budget for the search in seconds (optional). The search is abandoned when it runs out.
 
     Example Args:
         {"origin": "DEN", "destination": "LAX", "departure_date": "2025-08-01", "return_date": "2025-08-08"}
@@ -199,17 +231,19 @@ async def get_round_trip_flights(
         ]
         passengers_info = Passengers(adults=adults)
 
-        result = get_flights(
+        result = await get_flights_async(
             flight_data=flight_data,
             trip="round-trip",
             seat=seat_type,
             passengers=passengers_info,
+            hedge=True, # Race a second request if Google is slow to answer
+            timeout=timeout_seconds,
         )
 
         if result and result.flights:
             # Process flights based on the new parameter
             if return_cheapest_only:
-                cheapest_flight = min(result.flights, key=lambda f: parse_price(f.price))
+                cheapest_flight = min(result.flights, key=flight_price)
                 processed_flights = [flight_to_dict(cheapest_flight)]
                 result_key = "cheapest_round_trip_option" # Use a specific key for single result
             else:
@@ -241,6 +275,9 @@ async def get_round_trip_flights(
          # Return structured error
          error_payload = {"error": {"message": f"Invalid date format provided. Use YYYY-MM-DD.", "type": "ValueError"}}
          return json.dumps(error_payload)
+    except DeadlineExceeded:
+        error_payload = {"error": {"message": f"Deadline exceeded: no result within {timeout_seconds} seconds.", "type": "DeadlineExceeded"}}
+        return json.dumps(error_payload)
     except Exception as e:
         print(f"MCP Tool Error in get_round_trip_flights: {e}", file=sys.stderr)
         # Return structured error
@@ -262,7 +299,9 @@ async def find_all_flights_in_range( # Renamed function
     adults: int = 1,
     seat_type: str = "economy",
     return_cheapest_only: bool = False, # Added parameter
-    airline_filter: str = None # Added airline filter parameter
+    airline_filter: str = None, # Added airline filter parameter
+    max_concurrency: int = 5,
+    timeout_seconds: float = None
 ) -> str:
     """
     Finds available round-trip flights within a specified date range.
@@ -279,6 +318,9 @@ async def find_all_flights_in_range( # Renamed function
         seat_type: Fare class (e.g., "economy", "business", default: "economy").
         return_cheapest_only: If True, returns only the cheapest flight for each date pair (default: False).
         airline_filter: Filter flights by specific airline name (optional). Case-insensitive partial matching.
+        max_concurrency: Maximum number of date pairs searched at the same time (default: 5).
+        timeout_seconds: Time budget for the whole range search in seconds (optional). When it runs out,
+            the date pairs completed so far are returned along with "deadline_exceeded": true.
 
     Example Args:
         {"origin": "JFK", "destination": "MIA", "start_date_str": "2025-09-10", "end_date_str": "2025-09-20", "min_stay_days": 5}
@@ -345,26 +387,35 @@ async def find_all_flights_in_range( # Renamed function
                 total_combinations += 1
                 date_pairs_to_check.append((depart_date, return_date))
 
-    print(f"MCP Tool: Checking {total_combinations} valid date combinations in range...", file=sys.stderr)
+    print(f"MCP Tool: Checking {total_combinations} valid date combinations in range (max {max_concurrency} in flight)...", file=sys.stderr)
     count = 0
-
-    for depart_date, return_date in date_pairs_to_check:
-        count += 1
-        if count % 10 == 0: # Log progress
-            print(f"MCP Tool Progress: Checking {depart_date.strftime('%Y-%m-%d')} -> {return_date.strftime('%Y-%m-%d')} ({count}/{total_combinations})", file=sys.stderr)
-
+    started_at = time.monotonic()
+    deadline_at = started_at + timeout_seconds if timeout_seconds is not None else None
+
+    async def check_pair(date_pair):
+        """Searches one date pair.
+        Returns (result entry or None, error message or None, whether the deadline cut it short)."""
+        nonlocal count
+        depart_date, return_date = date_pair
         try:
+            remaining_seconds = None
+            if deadline_at is not None:
+                remaining_seconds = deadline_at - time.monotonic()
+                if remaining_seconds <= 0: # Out of time before this pair could start
+                    return None, None, True
+
             flight_data = [
                 FlightData(date=depart_date.strftime('%Y-%m-%d'), from_airport=origin, to_airport=destination),
                 FlightData(date=return_date.strftime('%Y-%m-%d'), from_airport=destination, to_airport=origin),
             ]
             passengers_info = Passengers(adults=adults)
 
-            result = get_flights(
+            result = await get_flights_async(
                 flight_data=flight_data,
                 trip="round-trip",
                 seat=seat_type,
                 passengers=passengers_info,
+                timeout=remaining_seconds,
             )
 
             # Collect results based on mode
@@ -375,35 +426,64 @@ async def find_all_flights_in_range( # Renamed function
                 if filtered_flights:  # Only process if there are flights after filtering
                     if return_cheapest_only:
                         # Find and store only the cheapest for this pair
-                        cheapest_flight_for_pair = min(filtered_flights, key=lambda f: parse_price(f.price))
-                        results_data.append({
+                        cheapest_flight_for_pair = min(filtered_flights, key=flight_price)
+                        return {
                             "departure_date": depart_date.strftime('%Y-%m-%d'),
                             "return_date": return_date.strftime('%Y-%m-%d'),
                             "cheapest_flight": flight_to_dict(cheapest_flight_for_pair) # Store single cheapest
-                        })
+                        }, None, False
                     else:
                         # Store all flights for this pair
                         flights_list = [flight_to_dict(f) for f in filtered_flights]
-                        results_data.append({
+                        return {
                             "departure_date": depart_date.strftime('%Y-%m-%d'),
                             "return_date": return_date.strftime('%Y-%m-%d'),
                             "flights": flights_list # Store list of all flights
-                        })
-            # else: # Optional: Log if no flights were found for a specific pair
-                # print(f"MCP Tool: No flights found for {depart_date.strftime('%Y-%m-%d')} -> {return_date.strftime('%Y-%m-%d')}", file=sys.stderr)
+                        }, None, False
+            return None, None, False
+
+        except DeadlineExceeded:
+            return None, None, True
 
         except Exception as e:
             # Log the specific error message to stderr for better debugging
             print(f"MCP Tool Error fetching for {depart_date.strftime('%Y-%m-%d')} -> {return_date.strftime('%Y-%m-%d')}: {type(e).__name__} - {str(e)}", file=sys.stderr)
             # Add a slightly more informative message to the results
             err_msg = f"Error fetching flights for {depart_date.strftime('%Y-%m-%d')} -> {return_date.strftime('%Y-%m-%d')}: {type(e).__name__}. Check server logs for details: {str(e)[:100]}..." # Include first 100 chars of error
-            if err_msg not in error_messages:
-                 error_messages.append(err_msg)
+            return None, err_msg, False
+
+        finally:
+            count += 1
+            if count % 10 == 0: # Log progress
+                print(f"MCP Tool Progress: {count}/{total_combinations} date pairs checked", file=sys.stderr)
+
+    pair_outcomes = await run_bounded(date_pairs_to_check, check_pair, max_concurrency)
+
+    # Aggregate in date-pair order so the output does not depend on completion order
+    incomplete_pairs = []
+    for (depart_date, return_date), (entry, err_msg, timed_out) in zip(date_pairs_to_check, pair_outcomes):
+        if timed_out:
+            incomplete_pairs.append(f"{depart_date.strftime('%Y-%m-%d')} -> {return_date.strftime('%Y-%m-%d')}")
+        if entry is not None:
+            results_data.append(entry)
+        if err_msg is not None and err_msg not in error_messages:
+            error_messages.append(err_msg)
+
+    elapsed = time.monotonic() - started_at
+    search_stats = {
+        "date_pairs_checked": total_combinations - len(incomplete_pairs),
+        "date_pairs_incomplete": len(incomplete_pairs),
+        "max_concurrency": max_concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "pairs_per_second": round((total_combinations - len(incomplete_pairs)) / elapsed, 3) if elapsed > 0 else None,
+    }
+    if incomplete_pairs:
+        print(f"MCP Tool: Deadline exceeded, {len(incomplete_pairs)} date pairs not completed.", file=sys.stderr)
 
     print("MCP Tool: Range search complete.", file=sys.stderr)
 
     # Return collected flight data
-    if results_data or error_messages: # Return even if only errors were found
+    if results_data or error_messages or incomplete_pairs: # Return even if only errors were found
         # Determine the key for the results based on the mode
         results_key = "cheapest_option_per_date_pair" if return_cheapest_only else "all_round_trip_options"
         output_data = {
@@ -420,8 +500,12 @@ async def find_all_flights_in_range( # Renamed function
                 "airline_filter": airline_filter # Include airline filter in output
             },
             results_key: results_data, # Use dynamic key for results
-            "errors_encountered": error_messages if error_messages else None
+            "errors_encountered": error_messages if error_messages else None,
+            "search_stats": search_stats
         }
+        if incomplete_pairs:
+            output_data["deadline_exceeded"] = True
+            output_data["incomplete_date_pairs"] = incomplete_pairs
         return json.dumps(output_data, indent=2)
     else:
         # This case should ideally not be reached if the loop runs and finds nothing,
@@ -433,10 +517,22 @@ async def find_all_flights_in_range( # Renamed function
                  "min_stay_days": min_stay_days, "max_stay_days": max_stay_days, "adults": adults, "seat_type": seat_type,
                  "airline_filter": airline_filter
             },
-            "errors_encountered": error_messages if error_messages else None
+            "errors_encountered": error_messages if error_messages else None,
+            "search_stats": search_stats
         })
 
 # --- Run the server ---
 if __name__ == "__main__":
+    # Parse pages in worker processes so range searches can use more than one core
+    parse_workers = int(os.environ.get("FAST_FLIGHTS_PARSE_WORKERS", "0"))
+    if parse_workers > 0:
+        configure_parse_pool(workers=parse_workers)
+
+    # Requests per second to the results host; raise it when that host is a
+    # local stand-in (see FAST_FLIGHTS_BASE_URL), ``0`` disables the limit
+    rate_limit = os.environ.get("FAST_FLIGHTS_RATE_LIMIT")
+    if rate_limit:
+        get_rate_limiter().configure(get_transport().host, "common", rate=float(rate_limit))
+
     # Run the server using stdio transport
     mcp.run(transport='stdio')
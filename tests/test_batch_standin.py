@@ -0,0 +1,52 @@
+"""Batched remote Playwright runs, served by the local stand-in."""
+
+import datetime
+
+import pytest
+
+from fast_flights import (
+    FlightData,
+    Passengers,
+    Result,
+    create_filter,
+    get_flights_from_filter_batch,
+)
+from fast_flights.standin import RUN_PATH, StandinServer
+
+DATES = ["2026-11-03", "2026-11-01", "2026-11-07", "2026-11-02"]
+
+
+def _filter(date: str):
+    return create_filter(
+        flight_data=[FlightData(date=date, from_airport="ICN", to_airport="NRT")],
+        trip="one-way",
+        passengers=Passengers(adults=1),
+        seat="economy",
+    )
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    with StandinServer(seed=1) as server:
+        monkeypatch.setenv("FAST_FLIGHTS_RUN_ENDPOINT", server.url + RUN_PATH)
+        yield server
+
+
+def test_batch_results_follow_input_order(standin):
+    results = get_flights_from_filter_batch([_filter(date) for date in DATES], timeout=10)
+
+    assert len(results) == len(DATES)
+    for result, date in zip(results, DATES):
+        assert isinstance(result, Result)
+        assert result.flights[0].departure_at.date() == datetime.date.fromisoformat(date)
+    assert standin.stats()["runs"] == 1
+
+
+def test_unrendered_page_becomes_its_exception(standin):
+    standin.malformed_rate = 1.0
+    results = get_flights_from_filter_batch([_filter(date) for date in DATES[:2]], timeout=10)
+
+    assert len(results) == 2
+    for result in results:
+        assert isinstance(result, RuntimeError)
+        assert "could not be loaded" in str(result)
@@ -0,0 +1,36 @@
+"""Local Playwright reads respect the caller's deadline."""
+
+import asyncio
+import time
+
+import pytest
+
+from fast_flights.deadline import DeadlineExceeded
+from fast_flights.local_playwright import _read_results
+
+
+class _Locator:
+    async def wait_for(self, timeout=None):
+        pass
+
+
+class _HungPage:
+    """A page whose results render, then never answer ``evaluate``."""
+
+    url = "https://www.google.com/travel/flights"
+
+    async def goto(self, url, timeout=None):
+        pass
+
+    def locator(self, selector):
+        return _Locator()
+
+    async def evaluate(self, script):
+        await asyncio.sleep(60)
+
+
+def test_hung_evaluate_stops_at_deadline():
+    started_at = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(_read_results(_HungPage(), "unused", timeout=0.2))
+    assert time.monotonic() - started_at < 2
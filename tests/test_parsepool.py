@@ -0,0 +1,28 @@
+"""Results rebuilt from parse workers share strings like in-process parses do."""
+
+import pytest
+
+from fast_flights.benchmark import synthetic_pages
+from fast_flights.parsepool import ParsePool
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParsePool(workers=1)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.parametrize("parser", ["dom", "embedded"])
+def test_pooled_results_share_strings(pool, parser):
+    page = synthetic_pages(1)[0].text
+    a = pool.parse(page, parser=parser, currency="USD")
+    b = pool.parse(page, parser=parser, currency="USD")
+
+    assert a.current_price is b.current_price
+    for x, y in zip(a.flights, b.flights):
+        for field in ("name", "departure", "arrival", "arrival_time_ahead", "duration"):
+            assert getattr(x, field) is getattr(y, field)
+        for s, t in zip(x.segments or [], y.segments or []):
+            for field in ("from_airport", "from_airport_name", "to_airport", "airline"):
+                assert getattr(s, field) is getattr(t, field)
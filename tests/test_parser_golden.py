@@ -0,0 +1,31 @@
+"""Parser output on the fixture pages must match ``fixtures/parser/golden.json``.
+
+Regenerate the records with ``python -m fast_flights.golden build
+fixtures/parser`` after an intended parser change.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from fast_flights import golden
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "parser"
+
+with open(FIXTURES / golden.GOLDEN, encoding="utf-8") as f:
+    RECORDS = json.load(f)
+
+CASES = [
+    pytest.param(name, parser, id=f"{name}-{parser}")
+    for name, entry in sorted(RECORDS.items())
+    for parser in entry["parsers"]
+]
+
+
+@pytest.mark.parametrize("name, parser", CASES)
+def test_matches_golden(name, parser):
+    entry = RECORDS[name]
+    text = (FIXTURES / entry["file"]).read_text(encoding="utf-8")
+    actual = golden.parse_entry(text, entry, parser)
+    assert golden.regressions(entry["parsers"][parser], actual) == []
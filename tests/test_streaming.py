@@ -0,0 +1,36 @@
+"""Early-terminating reads stop only at the real end of the results."""
+
+import pytest
+
+from fast_flights.golden import standin_fixtures
+from fast_flights.streaming import read_until_results
+
+PAGE = standin_fixtures()["one-way"]["text"]
+
+
+def _chunks(text: str, size: int):
+    data = text.encode("utf-8")
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 4096, 1 << 20])
+def test_stops_after_last_results_list(size):
+    body, _, stopped_early = read_until_results(_chunks(PAGE, size))
+
+    assert stopped_early
+    assert PAGE.startswith(body)
+    assert body.endswith("</ul>")
+    assert 'jsname="YdtKid"' in body
+
+
+def test_marker_before_results_reads_to_end():
+    # A container marker quoted in an inline script, ahead of the results
+    decoy = '<script>var t = \'<div jsname="YdtKid"></ul>\';</script>'
+    page = PAGE.replace("<body>", "<body>" + decoy, 1)
+    assert page != PAGE
+
+    body, bytes_read, stopped_early = read_until_results(_chunks(page, 256))
+
+    assert not stopped_early
+    assert body == page
+    assert bytes_read == len(page.encode("utf-8"))